@@ -6,54 +6,287 @@ Audio enhancement and processing for listening practice
 import sys
 import os
 import json
+from functools import lru_cache
 import numpy as np
 import librosa
 import soundfile as sf
 from scipy import signal
 
-def enhance_audio(input_path, output_path, options):
+try:
+    # pyFFTW is a drop-in scipy.fft replacement with plan caching
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft as fft
+    pyfftw.interfaces.cache.enable()
+except ImportError:
+    from scipy import fft
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import pedalboard
+    PEDALBOARD_AVAILABLE = hasattr(pedalboard, 'time_stretch')
+except ImportError:
+    PEDALBOARD_AVAILABLE = False
+
+try:
+    import cupy as cp
+    import cupyx
+    CUPY_AVAILABLE = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    CUPY_AVAILABLE = False
+
+# Below this many samples the host/device transfers outweigh the GPU FFT win
+GPU_MIN_SAMPLES = 30 * 22050
+
+N_FFT = 2048
+HOP_LENGTH = 512
+
+@lru_cache(maxsize=8)
+def _hann(n_fft):
+    """Cached float32 periodic Hann window"""
+    return signal.windows.hann(n_fft, sym=False).astype(np.float32)
+
+@lru_cache(maxsize=8)
+def _clarity_sos(sr):
+    """Cached SOS designs for the clarity filters at a given sample rate"""
+    sos_highpass = signal.butter(4, 100/(sr/2), 'highpass', output='sos')
+    sos_lowpass = signal.butter(4, 7000/(sr/2), 'lowpass', output='sos')
+    sos_bandlimit = np.vstack([sos_highpass, sos_lowpass])
+    sos_boost = signal.butter(2, [2000/(sr/2), 4000/(sr/2)], 'bandpass', output='sos')
+    return sos_bandlimit, sos_boost
+
+def _rstft(y, n_fft=N_FFT, hop_length=HOP_LENGTH):
+    """Real-input STFT returning (..., frames, n_fft // 2 + 1) complex bins
+
+    Accepts a single signal or a stacked (batch, samples) array; batches
+    are transformed in one broadcasted rfft call.
+    """
+    window = _hann(n_fft)
+    pad = [(0, 0)] * (y.ndim - 1) + [(n_fft // 2, n_fft // 2)]
+    y_padded = np.pad(y, pad, mode='reflect')
+    frames = np.lib.stride_tricks.sliding_window_view(y_padded, n_fft, axis=-1)[..., ::hop_length, :]
+    return fft.rfft(frames * window, axis=-1, workers=-1)
+
+def _overlap_add_numpy(frames, win_sq, hop_length):
+    """Windowed overlap-add of IFFT frames with window-envelope normalization"""
+    n_fft = frames.shape[1]
+    n_samples = n_fft + hop_length * (frames.shape[0] - 1)
+    y = np.zeros(n_samples, dtype=frames.dtype)
+    window_sum = np.zeros(n_samples, dtype=frames.dtype)
+    for i in range(frames.shape[0]):
+        start = i * hop_length
+        y[start:start + n_fft] += frames[i]
+        window_sum[start:start + n_fft] += win_sq
+    return y / np.maximum(window_sum, 1e-10)
+
+if NUMBA_AVAILABLE:
+    _overlap_add = njit(cache=True)(_overlap_add_numpy)
+else:
+    _overlap_add = _overlap_add_numpy
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_gate(stft_ri, noise_power, eps):
+        """Spectral gate fused into one pass, in place on the interleaved
+        real/imag float view of the rfft buffer
+
+        The inner loop walks the contiguous bin axis so LLVM can
+        auto-vectorize it with the widest SIMD width available.
+        """
+        n_frames = stft_ri.shape[0]
+        n_bins = stft_ri.shape[1] // 2
+        for t in prange(n_frames):
+            for k in range(n_bins):
+                re = stft_ri[t, 2 * k]
+                im = stft_ri[t, 2 * k + 1]
+                p = re * re + im * im
+                g = 1.0 - min(1.0, noise_power[k] / (p + eps))
+                stft_ri[t, 2 * k] = re * g
+                stft_ri[t, 2 * k + 1] = im * g
+else:
+    def _apply_gate(stft_ri, noise_power, eps):
+        """NumPy fallback for the fused spectral gate, in place on the view"""
+        re = stft_ri[:, 0::2]
+        im = stft_ri[:, 1::2]
+        power = re * re
+        power += im * im
+        power += eps
+        gain = np.minimum(1.0, noise_power[np.newaxis, :] / power, out=power)
+        np.subtract(1.0, gain, out=gain)
+        re *= gain
+        im *= gain
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _sos_forward_backward(sos, x, zi):
+        """Forward-backward biquad cascade (direct form II transposed)
+
+        zi holds sosfilt_zi's per-section steady-state conditions; each
+        pass seeds its state with zi scaled by the pass's first sample,
+        exactly as sosfiltfilt does, so the edge transient decays within
+        the odd-extension pad instead of ringing past it.
+        """
+        n_sections = sos.shape[0]
+        y = x.copy()
+        n = y.shape[0]
+        x0 = y[0]
+        for s in range(n_sections):
+            b0, b1, b2 = sos[s, 0], sos[s, 1], sos[s, 2]
+            a1, a2 = sos[s, 4], sos[s, 5]
+            z1 = zi[s, 0] * x0
+            z2 = zi[s, 1] * x0
+            for i in range(n):
+                xn = y[i]
+                yn = b0 * xn + z1
+                z1 = b1 * xn - a1 * yn + z2
+                z2 = b2 * xn - a2 * yn
+                y[i] = yn
+        xn_last = y[n - 1]
+        for s in range(n_sections):
+            b0, b1, b2 = sos[s, 0], sos[s, 1], sos[s, 2]
+            a1, a2 = sos[s, 4], sos[s, 5]
+            z1 = zi[s, 0] * xn_last
+            z2 = zi[s, 1] * xn_last
+            for i in range(n - 1, -1, -1):
+                xn = y[i]
+                yn = b0 * xn + z1
+                z1 = b1 * xn - a1 * yn + z2
+                z2 = b2 * xn - a2 * yn
+                y[i] = yn
+        return y
+
+_ZI_CACHE = {}
+
+def _sos_zi(sos):
+    """Steady-state section states for a SOS cascade, cached per filter"""
+    key = sos.tobytes()
+    zi = _ZI_CACHE.get(key)
+    if zi is None:
+        zi = np.ascontiguousarray(signal.sosfilt_zi(sos))
+        _ZI_CACHE[key] = zi
+    return zi
+
+def _filtfilt(sos, y):
+    """Zero-phase SOS filtering with a numba biquad cascade when available
+
+    The JIT path runs the whole cascade in one compiled per-sample loop
+    (no per-section Python/dispatch overhead) with scipy-style odd
+    extension at the edges; stacked input and short signals use scipy.
+    """
+    if NUMBA_AVAILABLE and y.ndim == 1:
+        padlen = 3 * (2 * sos.shape[0] + 1)
+        if y.shape[0] > padlen:
+            ext = np.concatenate((
+                2 * y[0] - y[padlen:0:-1], y, 2 * y[-1] - y[-2:-padlen - 2:-1]
+            ))
+            out = _sos_forward_backward(
+                np.ascontiguousarray(sos), ext.astype(np.float64), _sos_zi(sos)
+            )
+            return out[padlen:-padlen]
+    return signal.sosfiltfilt(sos, y, axis=-1)
+
+def _irstft(stft_matrix, length, n_fft=N_FFT, hop_length=HOP_LENGTH):
+    """Inverse of _rstft"""
+    window = _hann(n_fft)
+    frames = fft.irfft(stft_matrix, n=n_fft, axis=-1, workers=-1) * window
+    y = _overlap_add(frames, window ** 2, hop_length)
+    return y[n_fft // 2:n_fft // 2 + length]
+
+def _load_audio(input_path):
+    """Decode an audio file into a mono float32 signal
+
+    Reads directly through libsndfile; librosa remains the fallback for
+    formats libsndfile cannot decode.
+    """
+    try:
+        y, sr = sf.read(input_path, dtype='float32', always_2d=False)
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+    except RuntimeError:
+        y, sr = librosa.load(input_path, sr=None, dtype=np.float32)
+    return np.asarray(y, dtype=np.float32), sr
+
+def enhance_audio(input_path, output_path, options, loaded=None):
     """Enhance audio with various processing techniques"""
     try:
-        # Load audio file
-        y, sr = librosa.load(input_path, sr=None)
-        original_duration = librosa.get_duration(y=y, sr=sr)
-        
+        y, sr = loaded if loaded is not None else _load_audio(input_path)
+        original_duration = len(y) / sr
+
+        if len(y) == 0:
+            return {"error": "Audio file contains no samples"}
+
+        # Resolve all stage flags up front so disabled stages are skipped
+        # before any array work happens
+        apply_noise_reduction = bool(options.get('noise_reduction', True))
+        apply_clarity = bool(options.get('clarity_enhancement', True))
+        apply_normalization = bool(options.get('volume_normalization', True))
+        speed_factor = float(options.get('speed_adjustment', 1.0))
+
         # Apply noise reduction if requested
-        if options.get('noise_reduction', True):
+        if apply_noise_reduction:
             y = noise_reduction(y, sr)
-        
+
         # Apply speed adjustment if requested
-        speed_factor = float(options.get('speed_adjustment', 1.0))
         if speed_factor != 1.0:
             y = adjust_speed(y, sr, speed_factor)
-        
+
         # Apply clarity enhancement if requested
-        if options.get('clarity_enhancement', True):
+        if apply_clarity:
             y = enhance_clarity(y, sr)
-        
+
         # Apply volume normalization if requested
-        if options.get('volume_normalization', True):
+        if apply_normalization:
             y = normalize_volume(y)
-        
+
         # Save processed audio
         sf.write(output_path, y, sr)
-        
+
         # Calculate new duration
-        enhanced_duration = librosa.get_duration(y=y, sr=sr)
-        
+        enhanced_duration = len(y) / sr
+
         return {
             "original_duration": original_duration,
             "enhanced_duration": enhanced_duration,
             "speed_factor": speed_factor,
-            "noise_reduction_applied": options.get('noise_reduction', True),
-            "clarity_enhancement_applied": options.get('clarity_enhancement', True),
-            "volume_normalization_applied": options.get('volume_normalization', True),
+            "noise_reduction_applied": apply_noise_reduction,
+            "clarity_enhancement_applied": apply_clarity,
+            "volume_normalization_applied": apply_normalization,
             "sample_rate": sr
         }
         
     except Exception as e:
         return {"error": str(e)}
 
+def _noise_reduction_gpu(y, noise_power, length):
+    """CuPy spectral gate: STFT, gate, and overlap-add all on the GPU"""
+    window = cp.asarray(_hann(N_FFT))
+    y_padded = cp.pad(cp.asarray(y), N_FFT // 2, mode='reflect')
+    n_frames = 1 + (y_padded.shape[0] - N_FFT) // HOP_LENGTH
+    stride = y_padded.strides[0]
+    frames = cp.lib.stride_tricks.as_strided(
+        y_padded, shape=(n_frames, N_FFT), strides=(stride * HOP_LENGTH, stride)
+    )
+    stft = cp.fft.rfft(frames * window, axis=-1)
+
+    power = cp.abs(stft) ** 2
+    gain = 1 - cp.minimum(1, cp.asarray(noise_power)[cp.newaxis, :] / (power + 1e-10))
+    stft *= gain
+
+    frames = cp.fft.irfft(stft, n=N_FFT, axis=-1) * window
+    n_samples = N_FFT + HOP_LENGTH * (n_frames - 1)
+    indices = (cp.arange(n_frames)[:, cp.newaxis] * HOP_LENGTH + cp.arange(N_FFT)).ravel()
+    y_out = cp.zeros(n_samples, dtype=frames.dtype)
+    window_sum = cp.zeros(n_samples, dtype=frames.dtype)
+    cupyx.scatter_add(y_out, indices, frames.ravel())
+    cupyx.scatter_add(window_sum, indices, cp.tile(window ** 2, n_frames))
+    y_out /= cp.maximum(window_sum, 1e-10)
+
+    return cp.asnumpy(y_out[N_FFT // 2:N_FFT // 2 + length])
+
 def noise_reduction(y, sr):
     """Apply noise reduction to audio signal"""
     # Simple noise reduction using spectral gating
@@ -62,75 +295,213 @@ def noise_reduction(y, sr):
     # Estimate noise from the first 0.5 seconds (assuming it's background noise)
     noise_sample = y[:int(sr * 0.5)] if len(y) > int(sr * 0.5) else y
     
-    # Compute noise profile
-    noise_stft = librosa.stft(noise_sample)
-    noise_power = np.mean(np.abs(noise_stft)**2, axis=1)
-    
+    # Compute noise profile from a time-domain Welch PSD instead of a full
+    # noise STFT; same Hann window and hop as _rstft, so no noise
+    # spectrogram is ever materialized
+    window = _hann(N_FFT)
+    if len(noise_sample) >= N_FFT:
+        _, noise_power = signal.welch(
+            noise_sample, window=window, noverlap=N_FFT - HOP_LENGTH,
+            nfft=N_FFT, scaling='spectrum', detrend=False
+        )
+        # Rescale the one-sided spectrum back to mean |rfft|^2 units so
+        # the gate threshold matches the signal power below
+        noise_power = noise_power * window.sum() ** 2
+        noise_power[1:-1] *= 0.5
+    else:
+        # welch raises when the window outruns the signal; for clips
+        # shorter than one frame a single zero-padded windowed rfft
+        # yields the profile directly in |rfft|^2 units
+        padded = np.zeros(N_FFT, dtype=np.float64)
+        padded[:len(noise_sample)] = noise_sample
+        noise_power = np.abs(fft.rfft(padded * window)) ** 2
+
+    # Offload the STFT round-trip to the GPU for long signals
+    if CUPY_AVAILABLE and len(y) >= GPU_MIN_SAMPLES:
+        return _noise_reduction_gpu(y, noise_power, len(y))
+
     # Compute signal stft
-    signal_stft = librosa.stft(y)
-    signal_power = np.abs(signal_stft)**2
-    
-    # Apply spectral gating
-    gain = 1 - np.minimum(1, noise_power[:, np.newaxis] / (signal_power + 1e-10))
-    enhanced_stft = signal_stft * gain
-    
+    signal_stft = np.ascontiguousarray(_rstft(y))
+
+    # Gate the spectrum in place through its interleaved real/imag float
+    # view; no gain matrix or gated copy is ever allocated
+    stft_ri = signal_stft.view(np.float32).reshape(signal_stft.shape[0], -1)
+    _apply_gate(stft_ri, noise_power.astype(np.float32), np.float32(1e-10))
+
     # Inverse STFT
-    y_enhanced = librosa.istft(enhanced_stft, length=len(y))
-    
+    y_enhanced = _irstft(signal_stft, length=len(y))
+
     return y_enhanced
 
+def noise_reduction_batch(signals, sr):
+    """Spectral-gating noise reduction over a batch of same-rate signals
+
+    Zero-pads the signals into one (batch, samples) matrix so the noise
+    PSDs, STFT, gate, and inverse FFT each run as a single broadcasted
+    call instead of per-file Python iterations.
+    """
+    lengths = [len(y_sig) for y_sig in signals]
+    batch = np.zeros((len(signals), max(lengths)), dtype=np.float32)
+    for i, y_sig in enumerate(signals):
+        batch[i, :len(y_sig)] = y_sig
+
+    # Per-file noise profiles from the leading 0.5 seconds, one welch call
+    n_noise = max(1, min(int(sr * 0.5), min(lengths)))
+    window = _hann(N_FFT)
+    if n_noise >= N_FFT:
+        _, noise_power = signal.welch(
+            batch[:, :n_noise], window=window, noverlap=N_FFT - HOP_LENGTH,
+            nfft=N_FFT, scaling='spectrum', detrend=False, axis=-1
+        )
+        noise_power = noise_power * window.sum() ** 2
+        noise_power[:, 1:-1] *= 0.5
+    else:
+        # Same sub-frame fallback as noise_reduction, broadcast over the
+        # batch rows
+        padded = np.zeros((batch.shape[0], N_FFT), dtype=np.float64)
+        padded[:, :n_noise] = batch[:, :n_noise]
+        noise_power = np.abs(fft.rfft(padded * window, axis=-1)) ** 2
+
+    # One stacked STFT and one broadcasted gate over the whole batch
+    stft = _rstft(batch)
+    stft_re = np.ascontiguousarray(stft.real)
+    stft_im = np.ascontiguousarray(stft.imag)
+    power = stft_re * stft_re
+    power += stft_im * stft_im
+    power += 1e-10
+    gain = np.minimum(1.0, noise_power[:, np.newaxis, :] / power, out=power)
+    np.subtract(1.0, gain, out=gain)
+    stft_re *= gain
+    stft_im *= gain
+
+    frames = fft.irfft(stft_re + 1j * stft_im, n=N_FFT, axis=-1, workers=-1) * window
+    win_sq = window ** 2
+    return [
+        _overlap_add(frames[i], win_sq, HOP_LENGTH)[N_FFT // 2:N_FFT // 2 + n]
+        for i, n in enumerate(lengths)
+    ]
+
 def adjust_speed(y, sr, speed_factor):
     """Adjust playback speed without changing pitch"""
     if speed_factor == 1.0:
         return y
-    
-    # Time-stretch using librosa
+
+    # Prefer pedalboard's C++ time stretcher when available; fall back to
+    # librosa's phase vocoder, which stays in float32 for float32 input
+    if PEDALBOARD_AVAILABLE:
+        y_stretched = pedalboard.time_stretch(y, sr, stretch_factor=speed_factor)
+        return np.asarray(y_stretched, dtype=np.float32).reshape(-1)
+
     y_stretched = librosa.effects.time_stretch(y, rate=speed_factor)
-    
+
     return y_stretched
 
 def enhance_clarity(y, sr):
-    """Enhance speech clarity"""
-    # Apply a simple high-pass filter to remove low-frequency noise
-    b, a = signal.butter(4, 100/(sr/2), 'highpass')
-    y_filtered = signal.filtfilt(b, a, y)
-    
-    # Apply a simple low-pass filter to remove high-frequency noise
-    b, a = signal.butter(4, 7000/(sr/2), 'lowpass')
-    y_filtered = signal.filtfilt(b, a, y_filtered)
-    
-    # Apply a simple EQ to boost speech frequencies (around 2-4 kHz)
-    b, a = signal.butter(2, [2000/(sr/2), 4000/(sr/2)], 'bandpass')
-    y_boosted = signal.filtfilt(b, a, y_filtered) * 1.5
-    
-    # Mix the boosted signal with the original filtered signal
-    y_enhanced = y_filtered + y_boosted * 0.3
-    
-    return y_enhanced
+    """Enhance speech clarity
+
+    Accepts a single signal or a stacked (channels/batch, samples) array;
+    the filters vectorize over the leading axes in one C-level call.
+    """
+    # Cascaded high-pass + low-pass band-limiting filter and 2-4 kHz
+    # speech boost, designed once per sample rate
+    sos_bandlimit, sos_boost = _clarity_sos(sr)
+    y_filtered = _filtfilt(sos_bandlimit, y)
+
+    # Apply a simple EQ to boost speech frequencies (around 2-4 kHz).
+    # The 2-4 kHz band sits entirely inside the band-limit passband, so
+    # the boost is taken from the input directly rather than re-filtering
+    # the already band-limited signal; the 1.5 boost and 0.3 mix weights
+    # fold into a single multiply-add
+    y_filtered += _filtfilt(sos_boost, y) * (1.5 * 0.3)
+
+    # filtfilt computes in float64 internally, so drop back to float32
+    return y_filtered.astype(np.float32, copy=False)
 
 def normalize_volume(y):
     """Normalize audio volume"""
-    # Simple peak normalization
-    max_val = np.max(np.abs(y))
+    # Simple peak normalization, applied in place so the scaled signal
+    # goes straight to the final write without an extra full-size copy.
+    # The peak comes from two fused reductions instead of materializing
+    # a full |y| temporary
+    max_val = max(y.max(initial=0.0), -y.min(initial=0.0))
     if max_val > 0:
-        y_normalized = y / max_val * 0.9  # Leave some headroom
-    else:
-        y_normalized = y
-    
-    return y_normalized
+        y *= 0.9 / max_val  # Leave some headroom
+
+    return y
+
+def _enhance_job(job, loaded=None):
+    """Process a single serve-mode job dict"""
+    input_path = job.get("input", "")
+    output_path = job.get("output", "")
+    if not input_path or not output_path:
+        return {"error": "Input and output paths are required"}
+    if not os.path.exists(input_path):
+        return {"error": f"Input file not found: {input_path}"}
+    return enhance_audio(input_path, output_path, job.get("options", {}), loaded=loaded)
+
+def serve():
+    """Persistent worker mode: one JSON job per stdin line, one JSON result per stdout line
+
+    Keeps the interpreter (and numba/pyFFTW caches) warm across files and
+    pipelines the stages: while the current file is being enhanced, the
+    next files are already decoding on a small I/O pool, so disk/decode
+    time hides behind compute. Results are emitted in input order.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    def prefetch(job):
+        path = job.get("input", "")
+        try:
+            if path and os.path.exists(path):
+                return _load_audio(path)
+        except Exception:
+            pass  # let the compute stage reload and surface the error
+        return None
+
+    def emit(job, future):
+        # A long-lived worker must answer every line, so failures become
+        # error payloads instead of a dead process
+        try:
+            result = _enhance_job(job, future.result()) if future is not None else job
+        except Exception as e:
+            result = {"error": str(e)}
+        print(json.dumps(result), flush=True)
+
+    with ThreadPoolExecutor(max_workers=2) as io_pool:
+        pending = deque()
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                # Queue the error in the bad line's slot so results stay
+                # in input order and pending jobs are not dropped
+                pending.append(({"error": f"Invalid JSON job: {e}"}, None))
+            else:
+                pending.append((job, io_pool.submit(prefetch, job)))
+            if len(pending) > 2:
+                emit(*pending.popleft())
+        while pending:
+            emit(*pending.popleft())
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve()
+        sys.exit(0)
+
     if len(sys.argv) < 3:
         print(json.dumps({"error": "Input and output paths are required"}))
         sys.exit(1)
-    
+
     input_path = sys.argv[1]
     output_path = sys.argv[2]
     options = json.loads(sys.argv[3]) if len(sys.argv) > 3 else {}
-    
+
     if not os.path.exists(input_path):
         print(json.dumps({"error": f"Input file not found: {input_path}"}))
         sys.exit(1)
-    
+
     result = enhance_audio(input_path, output_path, options)
     print(json.dumps(result))
@@ -3,13 +3,38 @@
 Advanced Error Detection and Correction System for Essay Writing
 """
 import re
+import sys
 import json
+from array import array
+from bisect import bisect_left
+from heapq import merge as heap_merge
+from operator import itemgetter
 import numpy as np
 import spacy
 from typing import List, Dict, Tuple, Any
 import logging
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
 import string
+import threading
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +44,90 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Interned span keys hit the dict lookup identity fast path instead of
+# falling through to full string comparison on every probe
+_K_START = sys.intern("start_pos")
+_K_END = sys.intern("end_pos")
+_K_CONF = sys.intern("confidence")
+
+# Every detector sets the span keys on each error it emits, so the
+# C-level itemgetters need no .get defaults
+_by_start = itemgetter(_K_START)
+_get_span = itemgetter(_K_START, _K_END, _K_CONF)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _overlap_mask(starts, ends, order):
+        """Greedy non-overlap sweep over presorted indices (int32 arrays)"""
+        n = order.shape[0]
+        keep = np.zeros(n, dtype=np.bool_)
+        last_end = np.int32(-1)
+        for i in range(n):
+            idx = order[i]
+            if starts[idx] >= last_end:
+                keep[i] = True
+                last_end = ends[idx]
+        return keep
+
+def _compile_hot(pattern, flags=0):
+    """Compile a hot-path regex with the re2 DFA engine when available"""
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(pattern, flags)
+        except Exception:
+            # re2 rejects backtracking features (lookaround, backrefs)
+            pass
+    return re.compile(pattern, flags)
+
+_WORD_RE = _compile_hot(r'\b\w+\b')
+
+# ASCII fast path: byte-level lowercasing and tokenization stay inside
+# tight C loops instead of the Unicode property tables
+_ASCII_LOWER_TABLE = bytes.maketrans(
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz'
+)
+_WORD_RE_BYTES = re.compile(rb'\w+')
+
+# A paragraph is a maximal run of non-blank lines; finditer yields the
+# span directly so no split/strip copies or text.find rescans are needed
+_PARAGRAPH_RE = re.compile(r'[^\n]+(?:\n(?!\n)[^\n]*)*')
+
+# Sentence spans for detect_clarity_issues; compiled once
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+_TOKEN_RE = re.compile(r'\S+')
+
+def _build_automaton(words):
+    """Build an Aho-Corasick automaton over a lowercase word/phrase list"""
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+def _iter_word_matches(automaton, text_lower):
+    """Yield (start, end, word) automaton hits that fall on word boundaries"""
+    n = len(text_lower)
+    for end_index, word in automaton.iter(text_lower):
+        start = end_index - len(word) + 1
+        end = end_index + 1
+        if (start == 0 or not text_lower[start - 1].isalnum()) and \
+                (end == n or not text_lower[end].isalnum()):
+            yield start, end, word
+
+def _compile_pattern_bank(patterns, flags=0):
+    """Fuse a pattern list into one scanner regex with named groups
+
+    Returns (compiled_regex, group_name -> pattern_info map); the text is
+    then walked once for the whole bank instead of once per pattern.
+    """
+    parts = []
+    group_map = {}
+    for i, pattern_info in enumerate(patterns):
+        name = f"p{i}"
+        parts.append(f"(?P<{name}>{pattern_info['pattern']})")
+        group_map[name] = pattern_info
+    return _compile_hot("|".join(parts), flags), group_map
+
 class AdvancedErrorDetector:
     """
     Advanced error detection system for comprehensive essay analysis
@@ -36,14 +145,24 @@ class AdvancedErrorDetector:
         Initialize NLP components and models
         """
         try:
-            # Load spaCy model
-            self.nlp = spacy.load("en_core_web_sm")
+            # Load spaCy model; the pattern detectors only need tagging,
+            # so skip the expensive parser/NER/lemmatizer components
+            self.nlp = spacy.load(
+                "en_core_web_sm", disable=["parser", "ner", "lemmatizer"]
+            )
             logger.info("spaCy model loaded successfully")
             self.nlp_available = True
         except OSError:
             logger.warning("spaCy model not available, using rule-based detection only")
             self.nlp = None
             self.nlp_available = False
+
+        # One parsed Doc is shared by all detectors per analyzed text
+        self._doc = None
+        self._doc_text = None
+
+        # Full-analysis results memoized by text hash for repeat submissions
+        self._result_cache = {}
         
         # Error type definitions
         self.error_types = {
@@ -57,6 +176,23 @@ class AdvancedErrorDetector:
             "clarity": "Clarity Issue"
         }
         
+    def get_doc(self, text: str):
+        """
+        Parse the text once and reuse the spaCy Doc across detectors
+
+        Args:
+            text: Text to parse
+
+        Returns:
+            Cached spaCy Doc, or None when the model is unavailable
+        """
+        if not self.nlp_available:
+            return None
+        if self._doc_text != text:
+            self._doc = self.nlp(text)
+            self._doc_text = text
+        return self._doc
+
     def load_error_patterns(self):
         """
         Load comprehensive error patterns and dictionaries
@@ -128,7 +264,21 @@ class AdvancedErrorDetector:
             "writting": "writing",
             "grammer": "grammar"
         }
-        
+
+        # Stopwords ignored by detect_word_repetition
+        self.common_words = frozenset((
+            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
+            'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+        ))
+
+        # Redundant phrases checked by detect_redundancy_issues
+        self.redundant_phrases = [
+            'free gift', 'future plans', 'past history', 'advance planning',
+            'close proximity', 'final outcome', 'unexpected surprise', 'true fact'
+        ]
+
         # Word choice confusions
         self.word_choice_errors = {
             "affect": ["effect"],
@@ -168,14 +318,14 @@ class AdvancedErrorDetector:
         self.grammar_patterns = [
             # Subject-verb agreement
             {
-                "pattern": r"\b(he|she|it)\s+(are|were)\b",
+                "pattern": r"\b(?:he|she|it)\s+(?:are|were)\b",
                 "type": "grammar",
                 "message": "Subject-verb agreement error",
                 "suggestion": "Use 'is' or 'was' with singular subjects",
                 "severity": "high"
             },
             {
-                "pattern": r"\b(they|we|you)\s+(is|was)\b",
+                "pattern": r"\b(?:they|we|you)\s+(?:is|was)\b",
                 "type": "grammar", 
                 "message": "Subject-verb agreement error",
                 "suggestion": "Use 'are' or 'were' with plural subjects",
@@ -211,7 +361,7 @@ class AdvancedErrorDetector:
             
             # Sentence fragments
             {
-                "pattern": r"\b(Because|Since|Although|While|If)\s+[^.!?]*\.\s*[A-Z]",
+                "pattern": r"\b(?:Because|Since|Although|While|If)\s+[^.!?]*\.\s*[A-Z]",
                 "type": "grammar",
                 "message": "Possible sentence fragment",
                 "suggestion": "Complete the dependent clause or connect to main clause",
@@ -282,7 +432,72 @@ class AdvancedErrorDetector:
                 "severity": "low"
             }
         ]
+
+        # Every literal trigger (misspellings, confusable words, redundant
+        # phrases) merges into one tagged lexicon so a single automaton or
+        # alternation pass feeds all three dictionary detectors
+        self._lexicon_tags = {}
+        for word in self.spelling_corrections:
+            self._lexicon_tags[word] = "spelling"
+        for word in self.word_choice_errors:
+            self._lexicon_tags.setdefault(word, "word_choice")
+        for phrase in self.redundant_phrases:
+            self._lexicon_tags.setdefault(phrase, "redundancy")
+        if AHOCORASICK_AVAILABLE:
+            self.lexicon_automaton = _build_automaton(self._lexicon_tags)
+        else:
+            self.lexicon_automaton = None
+        literals = sorted(self._lexicon_tags, key=len, reverse=True)
+        self.lexicon_pattern = _compile_hot(
+            r'\b(?:' + '|'.join(map(re.escape, literals)) + r')\b',
+            re.IGNORECASE
+        )
+        self._lexicon_cache_key = None
+        self._lexicon_cache_hits = None
+
+        # Scanned over the full essay by detect_passive_voice
+        self.passive_pattern = _compile_hot(
+            r'\b(?:is|are|was|were|be|been|being)\s+\w*ed\b', re.IGNORECASE
+        )
+
+        # Fuse each same-flag pattern list into a single named-group
+        # scanner compiled once at load time
+        self.grammar_scanner = _compile_pattern_bank(self.grammar_patterns, re.IGNORECASE)
+        self.punctuation_scanner = _compile_pattern_bank(self.punctuation_patterns)
+        self.style_scanner = _compile_pattern_bank(self.style_patterns, re.IGNORECASE)
         
+    def _scan_lexicon(self, text: str, text_lower: str = None) -> Dict[str, List[Tuple[int, int, str]]]:
+        """
+        Scan the text once for every tagged lexicon literal
+
+        Args:
+            text: Text to analyze
+            text_lower: Optional precomputed text.lower() to avoid recopying
+
+        Returns:
+            Dict mapping tag to a list of (start, end, lowercase word) hits
+        """
+        cache_key = hash(text)
+        if cache_key == self._lexicon_cache_key:
+            return self._lexicon_cache_hits
+
+        hits = {"spelling": [], "word_choice": [], "redundancy": []}
+        if self.lexicon_automaton is not None:
+            if text_lower is None:
+                text_lower = text.lower()
+            matches = _iter_word_matches(self.lexicon_automaton, text_lower)
+        else:
+            matches = (
+                (m.start(), m.end(), m.group(0).lower())
+                for m in self.lexicon_pattern.finditer(text)
+            )
+        for start, end, word in matches:
+            hits[self._lexicon_tags[word]].append((start, end, word))
+
+        self._lexicon_cache_key = cache_key
+        self._lexicon_cache_hits = hits
+        return hits
+
     def detect_all_errors(self, text: str) -> List[Dict[str, Any]]:
         """
         Detect all types of errors in the text
@@ -293,57 +508,98 @@ class AdvancedErrorDetector:
         Returns:
             List of detected errors
         """
+        # Empty or whitespace-only input has nothing to analyze. Short
+        # text must still run: a single misspelled word or a three-word
+        # agreement error is a realistic submission here.
+        if not text.strip():
+            return []
+
+        cache_key = hash(text)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         logger.info(f"Analyzing text of length {len(text)} characters")
-        
-        all_errors = []
-        
-        # Detect different types of errors
-        all_errors.extend(self.detect_spelling_errors(text))
-        all_errors.extend(self.detect_grammar_errors(text))
-        all_errors.extend(self.detect_punctuation_errors(text))
-        all_errors.extend(self.detect_word_choice_errors(text))
-        all_errors.extend(self.detect_style_issues(text))
-        all_errors.extend(self.detect_coherence_issues(text))
-        all_errors.extend(self.detect_redundancy_issues(text))
-        all_errors.extend(self.detect_clarity_issues(text))
-        
-        # Sort errors by position
-        all_errors.sort(key=lambda x: x.get("start_pos", 0))
-        
-        # Remove duplicates and overlapping errors
-        filtered_errors = self.filter_overlapping_errors(all_errors)
+
+        # One lowercase copy shared by every detector that needs one
+        text_lower = text.lower()
+
+        detectors = (
+            (self.detect_spelling_errors, (text, text_lower)),
+            (self.detect_grammar_errors, (text,)),
+            (self.detect_punctuation_errors, (text,)),
+            (self.detect_word_choice_errors, (text, text_lower)),
+            (self.detect_style_issues, (text,)),
+            (self.detect_coherence_issues, (text,)),
+            (self.detect_redundancy_issues, (text, text_lower)),
+            (self.detect_clarity_issues, (text,)),
+        )
+
+        # Long essays fan the independent detectors out to worker threads;
+        # the regex engines do the bulk of the work at C level. Short texts
+        # stay serial to skip the pool overhead.
+        if len(text) > 5000:
+            # Warm the shared lexicon scan so workers hit the cache
+            self._scan_lexicon(text, text_lower)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(fn, *args) for fn, args in detectors]
+                streams = [future.result() for future in futures]
+        else:
+            streams = [fn(*args) for fn, args in detectors]
+
+        # Each detector emits in (near) text order, so sorting the short
+        # per-detector lists is near-linear and a k-way merge replaces the
+        # global concat-and-sort
+        for stream in streams:
+            stream.sort(key=_by_start)
+        all_errors = list(heap_merge(*streams, key=_by_start))
+
+        # Build the columnar arrays once here so the overlap filter does
+        # not re-walk the dicts
+        arrays = self._error_arrays(all_errors) if len(all_errors) >= 64 else None
+
+        # Remove duplicates and overlapping errors; the k-way merge above
+        # already produced start order, so the filter skips its own sort
+        filtered_errors = self.filter_overlapping_errors(all_errors, arrays,
+                                                         assume_sorted=True)
         
         logger.info(f"Detected {len(filtered_errors)} errors")
-        return filtered_errors
+
+        if len(self._result_cache) >= 32:
+            self._result_cache.clear()
+        self._result_cache[cache_key] = filtered_errors
+        return list(filtered_errors)
     
-    def detect_spelling_errors(self, text: str) -> List[Dict[str, Any]]:
+    def detect_spelling_errors(self, text: str, text_lower: str = None) -> List[Dict[str, Any]]:
         """
         Detect spelling errors
         
         Args:
             text: Text to analyze
+            text_lower: Optional precomputed lowercase copy
             
         Returns:
             List of spelling errors
         """
         errors = []
-        
-        # Check against known misspellings
-        for wrong, correct in self.spelling_corrections.items():
-            pattern = r'\b' + re.escape(wrong) + r'\b'
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                errors.append({
-                    "type": "spelling",
-                    "error_type": self.error_types["spelling"],
-                    "text": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "suggestion": correct,
-                    "explanation": f"'{match.group(0)}' should be '{correct}'",
-                    "severity": "medium",
-                    "confidence": 0.9
-                })
-        
+        error_type = self.error_types["spelling"]
+
+        # Check against known misspellings via the shared lexicon scan
+        for start_pos, end_pos, word in self._scan_lexicon(text, text_lower)["spelling"]:
+            matched_text = text[start_pos:end_pos]
+            correct = self.spelling_corrections[word]
+            errors.append({
+                "type": "spelling",
+                "error_type": error_type,
+                "text": matched_text,
+                "start_pos": start_pos,
+                "end_pos": end_pos,
+                "suggestion": correct,
+                "explanation": f"'{matched_text}' should be '{correct}'",
+                "severity": "medium",
+                "confidence": 0.9
+            })
+
         return errors
     
     def detect_grammar_errors(self, text: str) -> List[Dict[str, Any]]:
@@ -358,22 +614,23 @@ class AdvancedErrorDetector:
         """
         errors = []
         
-        for pattern_info in self.grammar_patterns:
-            pattern = pattern_info["pattern"]
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                suggestion = self.generate_grammar_suggestion(match.group(0), pattern_info)
-                
-                errors.append({
-                    "type": "grammar",
-                    "error_type": self.error_types["grammar"],
-                    "text": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "suggestion": suggestion,
-                    "explanation": pattern_info["message"] + ". " + pattern_info["suggestion"],
-                    "severity": pattern_info["severity"],
-                    "confidence": 0.8
-                })
+        scanner, group_map = self.grammar_scanner
+        error_type = self.error_types["grammar"]
+        for match in scanner.finditer(text):
+            pattern_info = group_map[match.lastgroup]
+            suggestion = self.generate_grammar_suggestion(match.group(0), pattern_info)
+
+            errors.append({
+                "type": "grammar",
+                "error_type": error_type,
+                "text": match.group(0),
+                "start_pos": match.start(),
+                "end_pos": match.end(),
+                "suggestion": suggestion,
+                "explanation": pattern_info["message"] + ". " + pattern_info["suggestion"],
+                "severity": pattern_info["severity"],
+                "confidence": 0.8
+            })
         
         return errors
     
@@ -389,66 +646,61 @@ class AdvancedErrorDetector:
         """
         errors = []
         
-        for pattern_info in self.punctuation_patterns:
-            pattern = pattern_info["pattern"]
-            for match in re.finditer(pattern, text):
-                suggestion = self.generate_punctuation_suggestion(match.group(0), pattern_info)
-                
-                errors.append({
-                    "type": "punctuation",
-                    "error_type": self.error_types["punctuation"],
-                    "text": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "suggestion": suggestion,
-                    "explanation": pattern_info["message"] + ". " + pattern_info["suggestion"],
-                    "severity": pattern_info["severity"],
-                    "confidence": 0.8
-                })
+        error_type = self.error_types["punctuation"]
+        scanner, group_map = self.punctuation_scanner
+        for match in scanner.finditer(text):
+            pattern_info = group_map[match.lastgroup]
+            suggestion = self.generate_punctuation_suggestion(match.group(0), pattern_info)
+
+            errors.append({
+                "type": "punctuation",
+                "error_type": error_type,
+                "text": match.group(0),
+                "start_pos": match.start(),
+                "end_pos": match.end(),
+                "suggestion": suggestion,
+                "explanation": pattern_info["message"] + ". " + pattern_info["suggestion"],
+                "severity": pattern_info["severity"],
+                "confidence": 0.8
+            })
         
         return errors
     
-    def detect_word_choice_errors(self, text: str) -> List[Dict[str, Any]]:
+    def detect_word_choice_errors(self, text: str, text_lower: str = None) -> List[Dict[str, Any]]:
         """
         Detect word choice errors
         
         Args:
             text: Text to analyze
+            text_lower: Optional precomputed lowercase copy
             
         Returns:
             List of word choice errors
         """
         errors = []
-        
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_positions = {}
-        
-        # Map word positions
-        for match in re.finditer(r'\b\w+\b', text):
-            word = match.group(0).lower()
-            if word not in word_positions:
-                word_positions[word] = []
-            word_positions[word].append((match.start(), match.end(), match.group(0)))
-        
-        # Check for word choice errors
-        for word, alternatives in self.word_choice_errors.items():
-            if word in word_positions:
-                for start_pos, end_pos, original_text in word_positions[word]:
-                    # Context-based suggestion (simplified)
-                    suggestion = self.get_context_based_suggestion(text, word, alternatives, start_pos)
-                    
-                    errors.append({
-                        "type": "word_choice",
-                        "error_type": self.error_types["word_choice"],
-                        "text": original_text,
-                        "start_pos": start_pos,
-                        "end_pos": end_pos,
-                        "suggestion": suggestion,
-                        "explanation": f"'{original_text}' might be confused with similar words. Check context.",
-                        "severity": "medium",
-                        "confidence": 0.6
-                    })
-        
+
+        error_type = self.error_types["word_choice"]
+
+        # Confusable words come out of the shared lexicon scan
+        for start_pos, end_pos, word in self._scan_lexicon(text, text_lower)["word_choice"]:
+            alternatives = self.word_choice_errors[word]
+            original_text = text[start_pos:end_pos]
+
+            # Context-based suggestion (simplified)
+            suggestion = self.get_context_based_suggestion(text, word, alternatives, start_pos)
+
+            errors.append({
+                "type": "word_choice",
+                "error_type": error_type,
+                "text": original_text,
+                "start_pos": start_pos,
+                "end_pos": end_pos,
+                "suggestion": suggestion,
+                "explanation": f"'{original_text}' might be confused with similar words. Check context.",
+                "severity": "medium",
+                "confidence": 0.6
+            })
+
         return errors
     
     def detect_style_issues(self, text: str) -> List[Dict[str, Any]]:
@@ -463,23 +715,25 @@ class AdvancedErrorDetector:
         """
         errors = []
         
+        error_type = self.error_types["style"]
+
         # Pattern-based style issues
-        for pattern_info in self.style_patterns:
-            pattern = pattern_info["pattern"]
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                suggestion = self.generate_style_suggestion(match.group(0), pattern_info)
-                
-                errors.append({
-                    "type": "style",
-                    "error_type": self.error_types["style"],
-                    "text": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "suggestion": suggestion,
-                    "explanation": pattern_info["message"] + ". " + pattern_info["suggestion"],
-                    "severity": pattern_info["severity"],
-                    "confidence": 0.7
-                })
+        scanner, group_map = self.style_scanner
+        for match in scanner.finditer(text):
+            pattern_info = group_map[match.lastgroup]
+            suggestion = self.generate_style_suggestion(match.group(0), pattern_info)
+
+            errors.append({
+                "type": "style",
+                "error_type": error_type,
+                "text": match.group(0),
+                "start_pos": match.start(),
+                "end_pos": match.end(),
+                "suggestion": suggestion,
+                "explanation": pattern_info["message"] + ". " + pattern_info["suggestion"],
+                "severity": pattern_info["severity"],
+                "confidence": 0.7
+            })
         
         # Word repetition analysis
         repetition_errors = self.detect_word_repetition(text)
@@ -502,10 +756,20 @@ class AdvancedErrorDetector:
             List of coherence issues
         """
         errors = []
-        
-        paragraphs = text.split('\n\n')
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
-        
+
+        # Without a blank line there is at most one paragraph
+        if '\n\n' not in text:
+            return errors
+
+        # One finditer pass yields each paragraph with its offset; no
+        # split/strip copies and no text.find rescan afterwards
+        paragraphs = []
+        for m in _PARAGRAPH_RE.finditer(text):
+            part = m.group(0)
+            stripped = part.strip()
+            if stripped:
+                paragraphs.append((m.start() + (len(part) - len(part.lstrip())), stripped))
+
         if len(paragraphs) <= 1:
             return errors
         
@@ -516,67 +780,56 @@ class AdvancedErrorDetector:
             'first', 'second', 'third', 'finally', 'in conclusion', 'to summarize'
         ]
         
-        for i in range(1, len(paragraphs)):
-            paragraph = paragraphs[i]
+        error_type = self.error_types["coherence"]
+        for start_pos, paragraph in paragraphs[1:]:
             first_sentence = paragraph.split('.')[0].lower()
-            
+
             has_transition = any(word in first_sentence for word in transition_words)
-            
+
             if not has_transition and len(paragraph) > 50:
-                # Find position in original text
-                start_pos = text.find(paragraph)
-                if start_pos != -1:
-                    errors.append({
-                        "type": "coherence",
-                        "error_type": self.error_types["coherence"],
-                        "text": first_sentence[:50] + "...",
-                        "start_pos": start_pos,
-                        "end_pos": start_pos + len(first_sentence),
-                        "suggestion": "Add transition words",
-                        "explanation": "Consider adding transition words to improve paragraph flow.",
-                        "severity": "low",
-                        "confidence": 0.6
-                    })
+                errors.append({
+                    "type": "coherence",
+                    "error_type": error_type,
+                    "text": first_sentence[:50] + "...",
+                    "start_pos": start_pos,
+                    "end_pos": start_pos + len(first_sentence),
+                    "suggestion": "Add transition words",
+                    "explanation": "Consider adding transition words to improve paragraph flow.",
+                    "severity": "low",
+                    "confidence": 0.6
+                })
         
         return errors
     
-    def detect_redundancy_issues(self, text: str) -> List[Dict[str, Any]]:
+    def detect_redundancy_issues(self, text: str, text_lower: str = None) -> List[Dict[str, Any]]:
         """
         Detect redundancy and unnecessary repetition
         
         Args:
             text: Text to analyze
+            text_lower: Optional precomputed lowercase copy
             
         Returns:
             List of redundancy issues
         """
         errors = []
         
-        # Detect redundant phrases
-        redundant_phrases = [
-            r'\bfree gift\b',
-            r'\bfuture plans\b', 
-            r'\bpast history\b',
-            r'\badvance planning\b',
-            r'\bclose proximity\b',
-            r'\bfinal outcome\b',
-            r'\bunexpected surprise\b',
-            r'\btrue fact\b'
-        ]
-        
-        for phrase_pattern in redundant_phrases:
-            for match in re.finditer(phrase_pattern, text, re.IGNORECASE):
-                errors.append({
-                    "type": "redundancy",
-                    "error_type": self.error_types["redundancy"],
-                    "text": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "suggestion": self.get_redundancy_suggestion(match.group(0)),
-                    "explanation": "This phrase contains redundant words.",
-                    "severity": "low",
-                    "confidence": 0.8
-                })
+        error_type = self.error_types["redundancy"]
+
+        # Redundant phrases come out of the shared lexicon scan
+        for start_pos, end_pos, _ in self._scan_lexicon(text, text_lower)["redundancy"]:
+            phrase = text[start_pos:end_pos]
+            errors.append({
+                "type": "redundancy",
+                "error_type": error_type,
+                "text": phrase,
+                "start_pos": start_pos,
+                "end_pos": end_pos,
+                "suggestion": self.get_redundancy_suggestion(phrase),
+                "explanation": "This phrase contains redundant words.",
+                "severity": "low",
+                "confidence": 0.8
+            })
         
         return errors
     
@@ -591,28 +844,38 @@ class AdvancedErrorDetector:
             List of clarity issues
         """
         errors = []
-        
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        for sentence in sentences:
-            words = sentence.split()
-            
-            # Very long sentences
-            if len(words) > 40:
-                start_pos = text.find(sentence)
-                if start_pos != -1:
-                    errors.append({
-                        "type": "clarity",
-                        "error_type": self.error_types["clarity"],
-                        "text": sentence[:50] + "...",
-                        "start_pos": start_pos,
-                        "end_pos": start_pos + len(sentence),
-                        "suggestion": "Break into shorter sentences",
-                        "explanation": "This sentence is very long and may be hard to follow.",
-                        "severity": "medium",
-                        "confidence": 0.7
-                    })
+
+        # A 40-word sentence needs at least 40 separators in the whole text
+        if text.count(' ') + text.count('\n') < 40:
+            return errors
+
+        error_type = self.error_types["clarity"]
+
+        # Iterate sentence spans directly so each match carries its own
+        # offset instead of re-finding the sentence in the text
+        for match in _SENTENCE_RE.finditer(text):
+            raw = match.group(0)
+            # Cheap upper bound: 41 words need at least 40 separators
+            if raw.count(' ') + raw.count('\n') < 40:
+                continue
+            sentence = raw.strip()
+            if not sentence:
+                continue
+
+            # Very long sentences (exact count without building a list)
+            if sum(1 for _ in _TOKEN_RE.finditer(sentence)) > 40:
+                start_pos = match.start() + (len(raw) - len(raw.lstrip()))
+                errors.append({
+                    "type": "clarity",
+                    "error_type": error_type,
+                    "text": sentence[:50] + "...",
+                    "start_pos": start_pos,
+                    "end_pos": start_pos + len(sentence),
+                    "suggestion": "Break into shorter sentences",
+                    "explanation": "This sentence is very long and may be hard to follow.",
+                    "severity": "medium",
+                    "confidence": 0.7
+                })
         
         return errors
     
@@ -627,35 +890,43 @@ class AdvancedErrorDetector:
             List of repetition errors
         """
         errors = []
-        
-        # Count word frequencies
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_counts = Counter(words)
-        
-        # Filter out common words
-        common_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
-            'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
-        }
-        
+
+        # Count frequencies and remember first-occurrence spans in one scan;
+        # ASCII essays tokenize over lowercased bytes (same offsets)
+        word_counts = Counter()
+        first_spans = {}
+        if text.isascii():
+            low = text.encode('ascii').translate(_ASCII_LOWER_TABLE)
+            for match in _WORD_RE_BYTES.finditer(low):
+                word = match.group(0).decode('ascii')
+                word_counts[word] += 1
+                if word not in first_spans:
+                    first_spans[word] = (match.start(), match.end())
+        else:
+            for match in _WORD_RE.finditer(text):
+                word = match.group(0).lower()
+                word_counts[word] += 1
+                if word not in first_spans:
+                    first_spans[word] = (match.start(), match.end())
+        
+        error_type = self.error_types["style"]
+
+        # Filter out common words (shared frozenset built at load time)
         for word, count in word_counts.items():
-            if len(word) > 4 and word not in common_words and count > 5:
-                # Find first occurrence for error reporting
-                match = re.search(r'\b' + re.escape(word) + r'\b', text, re.IGNORECASE)
-                if match:
-                    errors.append({
-                        "type": "style",
-                        "error_type": self.error_types["style"],
-                        "text": word,
-                        "start_pos": match.start(),
-                        "end_pos": match.end(),
-                        "suggestion": "Use synonyms for variety",
-                        "explanation": f"The word '{word}' appears {count} times. Consider using synonyms.",
-                        "severity": "low",
-                        "confidence": 0.6
-                    })
+            if len(word) > 4 and word not in self.common_words and count > 5:
+                # First occurrence was recorded during the counting scan
+                start_pos, end_pos = first_spans[word]
+                errors.append({
+                    "type": "style",
+                    "error_type": error_type,
+                    "text": word,
+                    "start_pos": start_pos,
+                    "end_pos": end_pos,
+                    "suggestion": "Use synonyms for variety",
+                    "explanation": f"The word '{word}' appears {count} times. Consider using synonyms.",
+                    "severity": "low",
+                    "confidence": 0.6
+                })
         
         return errors
     
@@ -671,24 +942,30 @@ class AdvancedErrorDetector:
         """
         errors = []
         
-        # Simple passive voice detection
-        passive_pattern = r'\b(is|are|was|were|be|been|being)\s+\w*ed\b'
-        
-        for match in re.finditer(passive_pattern, text, re.IGNORECASE):
-            # Skip if followed by "by" (which is often intentional passive)
-            following_text = text[match.end():match.end()+10]
-            if not re.match(r'\s+by\b', following_text, re.IGNORECASE):
-                errors.append({
-                    "type": "style",
-                    "error_type": self.error_types["style"],
-                    "text": match.group(0),
-                    "start_pos": match.start(),
-                    "end_pos": match.end(),
-                    "suggestion": "Consider active voice",
-                    "explanation": "Consider rewriting in active voice for more direct expression.",
-                    "severity": "low",
-                    "confidence": 0.5
-                })
+        error_type = self.error_types["style"]
+
+        # Simple passive voice detection (compiled once, re2 when present)
+        n = len(text)
+        for match in self.passive_pattern.finditer(text):
+            # Skip if followed by "by" (which is often intentional passive);
+            # plain char tests beat spinning up a regex match per hit
+            i = match.end()
+            while i < n and text[i].isspace():
+                i += 1
+            if i > match.end() and text[i:i + 2].lower() == 'by' and \
+                    (i + 2 == n or not text[i + 2].isalnum()):
+                continue
+            errors.append({
+                "type": "style",
+                "error_type": error_type,
+                "text": match.group(0),
+                "start_pos": match.start(),
+                "end_pos": match.end(),
+                "suggestion": "Consider active voice",
+                "explanation": "Consider rewriting in active voice for more direct expression.",
+                "severity": "low",
+                "confidence": 0.5
+            })
         
         return errors
     
@@ -816,42 +1093,102 @@ class AdvancedErrorDetector:
         
         return redundancy_fixes.get(phrase.lower(), phrase)
     
-    def filter_overlapping_errors(self, errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _error_arrays(errors: List[Dict[str, Any]]) -> Tuple[Any, Any, Any]:
+        """Extract (starts, ends, quantized confidence) columns
+
+        Confidence is fixed-point uint16 (conf * 65535): integer sort keys
+        are cheaper than float compares and keep the whole columnar path
+        in integer registers. The dicts keep their float confidence.
+        """
+        n = len(errors)
+        starts = np.fromiter((e.get(_K_START, 0) for e in errors),
+                             dtype=np.int32, count=n)
+        ends = np.fromiter((e.get(_K_END, 0) for e in errors),
+                           dtype=np.int32, count=n)
+        conf = np.fromiter((int(e.get(_K_CONF, 0) * 65535) for e in errors),
+                           dtype=np.uint16, count=n)
+        return starts, ends, conf
+
+    def filter_overlapping_errors(self, errors: List[Dict[str, Any]],
+                                  arrays: Tuple[Any, Any, Any] = None,
+                                  assume_sorted: bool = False) -> List[Dict[str, Any]]:
         """
         Filter out overlapping errors, keeping the most confident ones
         
         Args:
-            errors: List of detected errors
+            errors: List of detected errors; may be reordered in place
+            arrays: Optional precomputed (starts, ends, confidence) columns
+            assume_sorted: Skip re-sorting when errors arrive in start order
             
         Returns:
             Filtered list of errors
         """
-        if not errors:
-            return errors
-        
-        # Sort by position and confidence
-        sorted_errors = sorted(errors, key=lambda x: (x.get("start_pos", 0), -x.get("confidence", 0)))
-        
+        # Nothing to filter for zero or one error; skip sort and sweep
+        if len(errors) < 2:
+            return list(errors)
+
+        # Large lists: vectorized sweep over SoA arrays instead of a
+        # Python loop of per-dict key lookups
+        if arrays is not None or len(errors) >= 64:
+            n = len(errors)
+            starts, ends, conf = arrays if arrays is not None else self._error_arrays(errors)
+            # Descending confidence via the uint16 complement, all-integer
+            order = np.lexsort((np.uint16(65535) - conf, starts))
+            if NUMBA_AVAILABLE:
+                # Compiled exact greedy sweep; only tracks ends of kept errors
+                keep = _overlap_mask(starts, ends, order)
+            else:
+                # Keep an error when it starts at or after every end so far
+                running_end = np.maximum.accumulate(ends[order])
+                keep = np.empty(n, dtype=bool)
+                keep[0] = True
+                keep[1:] = starts[order][1:] >= running_end[:-1]
+            return [errors[i] for i in order[keep]]
+
+        # Sort in place by position and confidence unless the producer
+        # already merged the detector streams in start order; Timsort on
+        # the near-sorted detector output is close to linear
+        if not assume_sorted:
+            errors.sort(key=lambda x: (x.get(_K_START, 0), -x.get(_K_CONF, 0)))
+        sorted_errors = errors
+
+        # Pull the spans out as plain tuples in one pass; the sweep then
+        # unpacks locals instead of hashing dict keys per iteration
+        spans = [_get_span(e) for e in sorted_errors]
+        # Compact int starts column so bisect can jump over whole blocks
+        # of overlapping errors instead of visiting each one
+        starts_arr = array('i', (span[0] for span in spans))
+
         filtered = []
-        last_end = -1
-        
-        for error in sorted_errors:
-            start_pos = error.get("start_pos", 0)
-            end_pos = error.get("end_pos", start_pos + 1)
-            
-            # If this error doesn't overlap with the last one, include it
-            if start_pos >= last_end:
-                filtered.append(error)
-                last_end = end_pos
-            # If it overlaps but has higher confidence, replace the last one
-            elif error.get("confidence", 0) > filtered[-1].get("confidence", 0):
-                filtered[-1] = error
-                last_end = end_pos
-        
+        i = 0
+        count = len(sorted_errors)
+        while i < count:
+            end_i = spans[i][1]
+            # The overlap block for this error ends where starts catch up
+            block_end = bisect_left(starts_arr, end_i, i + 1)
+            # Keep the most confident error in the block, tracking the
+            # winner in scalars instead of re-indexing spans
+            best = i
+            best_end = end_i
+            if block_end > i + 1:
+                best_conf = spans[i][2]
+                for k in range(i + 1, block_end):
+                    conf_k = spans[k][2]
+                    if conf_k > best_conf:
+                        best_conf = conf_k
+                        best = k
+                if best != i:
+                    best_end = spans[best][1]
+            filtered.append(sorted_errors[best])
+            # Skip everything starting before the kept error's end
+            i = bisect_left(starts_arr, best_end, block_end)
+
         return filtered
 
 # Singleton instance
 error_detector = None
+_detector_lock = threading.Lock()
 
 def get_error_detector():
     """
@@ -861,9 +1198,15 @@ def get_error_detector():
         AdvancedErrorDetector instance
     """
     global error_detector
-    if error_detector is None:
-        error_detector = AdvancedErrorDetector()
-    return error_detector
+    # Fast path without the lock; double-checked inside it so concurrent
+    # first requests cannot construct (and load models for) two detectors
+    detector = error_detector
+    if detector is None:
+        with _detector_lock:
+            detector = error_detector
+            if detector is None:
+                detector = error_detector = AdvancedErrorDetector()
+    return detector
 
 def detect_errors(text: str) -> List[Dict[str, Any]]:
     """
@@ -878,15 +1221,14 @@ def detect_errors(text: str) -> List[Dict[str, Any]]:
     detector = get_error_detector()
     return detector.detect_all_errors(text)
 
-if __name__ == "__main__":
-    # Test the error detector
-    test_text = """
-    The author of "The Challenge of Exploring Venus" presents a compelling argument for why studying Venus is worthwhile despite the challenges. The article effectively uses scientific evidence, historical context, and future possibilities to support this claim.
-    
-    First, the author provides strong scientific evidence about Venus's unique properties. The extreme temperatures and pressure are described in detail, showing why exploration is difficult. However the author balances this by explaining how these same challenges make Venus scientifically valuable.
-    
-    In conclusion, the author effectively supports the idea that Venus exploration is worthwhile through a balanced presentation of challenges and benefits
+def detect_errors_json(text: str) -> str:
     """
-    
-    errors = detect_errors(test_text)
-    print(json.dumps(errors, indent=2))
+    Detect errors and serialize the result in one step
+
+    Args:
+        text: The essay text to analyze
+
+    Returns:
+        Compact JSON array of the detected errors
+    """
+    return json.dumps(detect_errors(text), separators=(",", ":"))
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Manual test harness for the error detection module
+"""
+import json
+
+from error_detection import detect_errors
+
+if __name__ == "__main__":
+    # Test the error detector
+    test_text = """
+    The author of "The Challenge of Exploring Venus" presents a compelling argument for why studying Venus is worthwhile despite the challenges. The article effectively uses scientific evidence, historical context, and future possibilities to support this claim.
+
+    First, the author provides strong scientific evidence about Venus's unique properties. The extreme temperatures and pressure are described in detail, showing why exploration is difficult. However the author balances this by explaining how these same challenges make Venus scientifically valuable.
+
+    In conclusion, the author effectively supports the idea that Venus exploration is worthwhile through a balanced presentation of challenges and benefits
+    """
+
+    errors = detect_errors(test_text)
+    print(json.dumps(errors, indent=2))
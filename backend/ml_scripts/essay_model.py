@@ -14,14 +14,84 @@ from tensorflow.keras.layers import (
 )
 from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, ReduceLROnPlateau
-from transformers import TFBertModel, BertTokenizer, AutoTokenizer, AutoModel
+from transformers import TFAutoModel, AutoTokenizer
 import json
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from typing import Dict, List, Any, Tuple, Optional
 import re
 from collections import Counter
 import spacy
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import tf2onnx
+    TF2ONNX_AVAILABLE = True
+except ImportError:
+    TF2ONNX_AVAILABLE = False
+
+# Module-level compiled patterns and frozen vocabularies; rebuilt-per-call
+# literals show up once multiplied across every scored essay
+_WS_RE = re.compile(r'\s+')
+_SENT_FIX_RE = re.compile(r'([.!?])\s*([A-Z])')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+
+_ACADEMIC_WORDS = frozenset({
+    'analyze', 'evaluate', 'demonstrate', 'illustrate', 'examine',
+    'investigate', 'establish', 'determine', 'significant', 'substantial',
+    'comprehensive', 'fundamental', 'essential', 'crucial', 'critical',
+    'perspective', 'approach', 'methodology', 'framework', 'concept',
+    'theory', 'hypothesis', 'evidence', 'research', 'study',
+    'analysis', 'conclusion', 'argument', 'thesis', 'claim',
+    'furthermore', 'moreover', 'however', 'nevertheless', 'consequently',
+    'therefore', 'thus', 'hence', 'accordingly', 'subsequently'
+})
+
+_TRANSITIONS = (
+    'first', 'second', 'third', 'next', 'then', 'finally',
+    'however', 'furthermore', 'moreover', 'additionally',
+    'in addition', 'similarly', 'likewise', 'in contrast',
+    'on the other hand', 'meanwhile', 'consequently',
+    'therefore', 'thus', 'as a result', 'in conclusion'
+)
+
+# One automaton covering both vocabularies: tags record whether a hit
+# counts as academic ("A"), a transition ("T"), or both ("AT") for the
+# words appearing in both sets
+if AHOCORASICK_AVAILABLE:
+    _FEATURE_AC = ahocorasick.Automaton()
+    for _word in _ACADEMIC_WORDS:
+        _tag = "AT" if _word in _TRANSITIONS else "A"
+        _FEATURE_AC.add_word(_word, (_tag, _word))
+    for _phrase in set(_TRANSITIONS):
+        if _phrase not in _ACADEMIC_WORDS:
+            _FEATURE_AC.add_word(_phrase, ("T", _phrase))
+    _FEATURE_AC.make_automaton()
+else:
+    _FEATURE_AC = None
+
+_INTRO_INDICATORS = (
+    'in this essay', 'this essay will', 'i will argue',
+    'the author suggests', 'this paper', 'the purpose of'
+)
+_CONCLUSION_INDICATORS = (
+    'in conclusion', 'to conclude', 'in summary',
+    'therefore', 'thus', 'overall', 'finally'
+)
+_THESIS_INDICATORS = (
+    'argue', 'claim', 'believe', 'suggest', 'propose',
+    'maintain', 'assert', 'contend', 'demonstrate',
+    'prove', 'show', 'will discuss', 'will examine'
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,19 +104,29 @@ class AdvancedEssayScoringModel:
     """
     Advanced ML model for automated essay scoring with comprehensive analysis
     """
-    def __init__(self, model_path=None, bert_model_name="bert-base-uncased", max_length=512):
+    # Backbones cached per checkpoint name; rebuilding the model reuses
+    # the already-parsed weights instead of touching the HF cache (and
+    # possibly the network) again
+    _BACKBONE_CACHE = {}
+    
+    def __init__(self, model_path=None, bert_model_name="distilbert-base-uncased", max_length=512):
         """
         Initialize the advanced essay scoring model
         
         Args:
             model_path: Path to load a pre-trained model
-            bert_model_name: Name of the BERT model to use
+            bert_model_name: Name of the transformer backbone to use;
+                distilbert halves the layer count for ~97% of BERT quality
             max_length: Maximum sequence length for tokenizer
         """
         self.bert_model_name = bert_model_name
         self.max_length = max_length
-        self.tokenizer = BertTokenizer.from_pretrained(bert_model_name)
+        # use_fast pins the Rust tokenizer; the Python BPE fallback is
+        # 10-50x slower at max_length=512 and a real cost per essay
+        self.tokenizer = AutoTokenizer.from_pretrained(bert_model_name, use_fast=True)
         self.model = None
+        self.bert_model = None
+        self._infer = None
         self.history = None
         
         # Initialize NLP components
@@ -68,17 +148,37 @@ class AdvancedEssayScoringModel:
         Returns:
             Compiled Keras model
         """
-        # Input layers
-        input_ids = Input(shape=(self.max_length,), dtype=tf.int32, name="input_ids")
-        attention_mask = Input(shape=(self.max_length,), dtype=tf.int32, name="attention_mask")
+        # Mixed precision: bfloat16 on Ampere+/TPU, float16 with loss
+        # scaling on older GPUs, plain float32 on CPU-only hosts. Halves
+        # activation bandwidth and enables tensor-core matmuls for the
+        # BERT/LSTM stacks.
+        policy_name = "float32"
+        gpus = tf.config.list_physical_devices("GPU")
+        if gpus:
+            details = tf.config.experimental.get_device_details(gpus[0]) or {}
+            compute = details.get("compute_capability")
+            policy_name = "mixed_bfloat16" if compute and compute >= (8, 0) else "mixed_float16"
+            tf.keras.mixed_precision.set_global_policy(policy_name)
+        
+        # Input layers; the sequence axis stays dynamic so short essays
+        # can run at their bucketed length instead of always paying the
+        # full max_length**2 attention cost
+        input_ids = Input(shape=(None,), dtype=tf.int32, name="input_ids")
+        attention_mask = Input(shape=(None,), dtype=tf.int32, name="attention_mask")
+        
+        # Transformer backbone (DistilBERT by default; any BERT-family
+        # checkpoint with a last_hidden_state output works)
+        bert_model = self._BACKBONE_CACHE.get(self.bert_model_name)
+        if bert_model is None:
+            bert_model = TFAutoModel.from_pretrained(self.bert_model_name)
+            self._BACKBONE_CACHE[self.bert_model_name] = bert_model
+        
+        # Freeze the whole backbone initially. Setting trainable on the
+        # model (not its sublayers) is what actually excludes the nested
+        # transformer weights from the gradient computation.
+        bert_model.trainable = False
+        self.bert_model = bert_model
         
-        # BERT layer
-        bert_model = TFBertModel.from_pretrained(self.bert_model_name)
-        
-        # Freeze BERT layers initially
-        for layer in bert_model.layers:
-            layer.trainable = False
-            
         bert_outputs = bert_model({"input_ids": input_ids, "attention_mask": attention_mask})[0]
         
         # Custom transformer layers
@@ -92,10 +192,14 @@ class AdvancedEssayScoringModel:
         attention_output = LayerNormalization()(attention_output)
         attention_output = Add()([bert_outputs, attention_output])
         
-        # BiLSTM layers for sequential understanding
-        lstm_output = Bidirectional(LSTM(128, return_sequences=True, dropout=0.2))(attention_output)
+        # BiLSTM layers for sequential understanding. Keeping the LSTMs
+        # free of in-cell dropout preserves cuDNN's fused RNN kernel
+        # (any dropout inside the cell forces the unrolled fallback,
+        # 3-5x slower); regularization moves to explicit Dropout layers.
+        lstm_output = Bidirectional(LSTM(128, return_sequences=True))(attention_output)
         lstm_output = Dropout(0.3)(lstm_output)
-        lstm_output = Bidirectional(LSTM(64, return_sequences=True, dropout=0.2))(lstm_output)
+        lstm_output = Bidirectional(LSTM(64, return_sequences=True))(lstm_output)
+        lstm_output = Dropout(0.2)(lstm_output)
         
         # Pooling strategies
         avg_pool = GlobalAveragePooling1D()(lstm_output)
@@ -113,21 +217,21 @@ class AdvancedEssayScoringModel:
         
         # Multi-task outputs for different scoring aspects
         content_branch = Dense(64, activation="relu", name="content_branch")(dense2)
-        content_output = Dense(1, activation="sigmoid", name="content_score")(content_branch)
+        content_output = Dense(1, activation="sigmoid", dtype="float32", name="content_score")(content_branch)
         
         organization_branch = Dense(64, activation="relu", name="organization_branch")(dense2)
-        organization_output = Dense(1, activation="sigmoid", name="organization_score")(organization_branch)
+        organization_output = Dense(1, activation="sigmoid", dtype="float32", name="organization_score")(organization_branch)
         
         language_branch = Dense(64, activation="relu", name="language_branch")(dense2)
-        language_output = Dense(1, activation="sigmoid", name="language_score")(language_branch)
+        language_output = Dense(1, activation="sigmoid", dtype="float32", name="language_score")(language_branch)
         
         conventions_branch = Dense(64, activation="relu", name="conventions_branch")(dense2)
-        conventions_output = Dense(1, activation="sigmoid", name="conventions_score")(conventions_branch)
+        conventions_output = Dense(1, activation="sigmoid", dtype="float32", name="conventions_score")(conventions_branch)
         
         # Overall score as weighted combination
         overall_features = Concatenate()([content_branch, organization_branch, language_branch, conventions_branch])
         overall_dense = Dense(32, activation="relu")(overall_features)
-        overall_output = Dense(1, activation="sigmoid", name="overall_score")(overall_dense)
+        overall_output = Dense(1, activation="sigmoid", dtype="float32", name="overall_score")(overall_dense)
         
         # Create model
         model = Model(
@@ -141,9 +245,15 @@ class AdvancedEssayScoringModel:
             ]
         )
         
-        # Compile model with advanced optimizer
+        # Compile model with advanced optimizer; float16 needs dynamic
+        # loss scaling to keep small gradients from flushing to zero,
+        # bfloat16's exponent range does not
+        optimizer = Adam(learning_rate=2e-5, beta_1=0.9, beta_2=0.999, epsilon=1e-8)
+        if policy_name == "mixed_float16":
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
+        
         model.compile(
-            optimizer=Adam(learning_rate=2e-5, beta_1=0.9, beta_2=0.999, epsilon=1e-8),
+            optimizer=optimizer,
             loss={
                 "overall_score": "mse",
                 "content_score": "mse",
@@ -168,9 +278,247 @@ class AdvancedEssayScoringModel:
         )
         
         self.model = model
+        self._compile_infer()
+        
         logger.info("Advanced model built successfully")
         return model
     
+    def _compile_infer(self):
+        """
+        Build the XLA-compiled forward pass for the current model
+        
+        Skips Keras predict's dataset adapter and lets XLA fuse the
+        attention/LayerNorm elementwise chains into fewer kernels.
+        Compiled once per (dynamic) batch signature.
+        """
+        model = self.model
+        self._infer = tf.function(
+            lambda input_ids, attention_mask: model(
+                {"input_ids": input_ids, "attention_mask": attention_mask}, training=False
+            ),
+            input_signature=[
+                tf.TensorSpec((None, None), tf.int32),
+                tf.TensorSpec((None, None), tf.int32),
+            ],
+            jit_compile=True,
+        )
+    
+    def train(self, essays=None, encodings=None, scores=None, dataset=None,
+              validation_split=0.2, epochs=5, batch_size=16, accum_steps=4):
+        """
+        Train the scoring heads with a gradient-accumulation loop
+        
+        Each optimizer step accumulates gradients across accum_steps
+        micro-batches before applying them once, so the effective batch
+        stays large enough to keep the GPU busy while per-micro-batch
+        memory stays small. The inner step is XLA-compiled and unscales
+        gradients when the optimizer carries dynamic loss scaling.
+        
+        Args:
+            essays: Raw essay strings (tokenized here if encodings absent)
+            encodings: Dict with precomputed "input_ids"/"attention_mask"
+            scores: Dict of per-aspect target arrays on the 0-10 scale
+            dataset: Optional prebuilt tf.data.Dataset of (features, targets)
+            validation_split: Unused when a dataset is supplied
+            epochs: Number of passes over the data
+            batch_size: Micro-batch size when building the dataset here
+            accum_steps: Micro-batches accumulated per optimizer step
+        """
+        if self.model is None:
+            self.build_advanced_model()
+        
+        if dataset is None:
+            if encodings is None:
+                tokenized = self.tokenizer(
+                    list(essays), max_length=self.max_length,
+                    padding="max_length", truncation=True, return_tensors="np"
+                )
+                encodings = {"input_ids": tokenized["input_ids"],
+                             "attention_mask": tokenized["attention_mask"]}
+            dataset = tf.data.Dataset.from_tensor_slices((
+                {"input_ids": encodings["input_ids"],
+                 "attention_mask": encodings["attention_mask"]},
+                {k: np.asarray(v, np.float32) for k, v in scores.items()}
+            )).shuffle(1024).batch(batch_size).prefetch(tf.data.AUTOTUNE)
+        
+        model = self.model
+        optimizer = model.optimizer
+        loss_scaled = isinstance(optimizer, tf.keras.mixed_precision.LossScaleOptimizer)
+        aspects = ("overall", "content", "organization", "language", "conventions")
+        weights = (1.0, 0.8, 0.8, 0.8, 0.8)
+        accum = [tf.Variable(tf.zeros_like(v), trainable=False)
+                 for v in model.trainable_variables]
+        
+        @tf.function(jit_compile=True)
+        def accum_step(features, targets):
+            with tf.GradientTape() as tape:
+                outputs = model(features, training=True)
+                loss = 0.0
+                for output, aspect, weight in zip(outputs, aspects, weights):
+                    target = tf.cast(targets[aspect], tf.float32) / 10.0
+                    loss += weight * tf.reduce_mean(
+                        tf.square(target - tf.squeeze(output, axis=-1))
+                    )
+                loss /= accum_steps
+                if loss_scaled:
+                    loss = optimizer.get_scaled_loss(loss)
+            grads = tape.gradient(loss, model.trainable_variables)
+            if loss_scaled:
+                grads = optimizer.get_unscaled_gradients(grads)
+            for acc, grad in zip(accum, grads):
+                if grad is not None:
+                    acc.assign_add(grad)
+            return loss
+        
+        @tf.function
+        def apply_step():
+            optimizer.apply_gradients(zip(accum, model.trainable_variables))
+            for acc in accum:
+                acc.assign(tf.zeros_like(acc))
+        
+        if self.history is None:
+            self.history = {"loss": []}
+        for epoch in range(epochs):
+            epoch_loss = 0.0
+            micro_batches = 0
+            for features, targets in dataset:
+                epoch_loss += float(accum_step(features, targets))
+                micro_batches += 1
+                if micro_batches % accum_steps == 0:
+                    apply_step()
+            if micro_batches % accum_steps:
+                apply_step()
+            mean_loss = epoch_loss / max(micro_batches, 1)
+            self.history["loss"].append(mean_loss)
+            logger.info(f"Epoch {epoch + 1}/{epochs} - loss: {mean_loss:.4f}")
+    
+    def build_model(self):
+        """Build the model; name kept for the training scripts"""
+        return self.build_advanced_model()
+    
+    def fine_tune(self, essays=None, encodings=None, scores=None, dataset=None,
+                  epochs=3, batch_size=8, accum_steps=4, learning_rate=1e-5):
+        """
+        Unfreeze the backbone and continue training at a lower rate
+        
+        The first training phase leaves the transformer frozen; this
+        second phase makes it trainable and drops the learning rate an
+        order of magnitude so the pretrained weights move gently.
+        """
+        if self.model is None:
+            self.build_advanced_model()
+        if self.bert_model is not None:
+            self.bert_model.trainable = True
+        self.model.optimizer.learning_rate.assign(learning_rate)
+        self.train(essays=essays, encodings=encodings, scores=scores,
+                   dataset=dataset, epochs=epochs, batch_size=batch_size,
+                   accum_steps=accum_steps)
+    
+    def evaluate(self, essays, scores, encodings=None, batch_size=32):
+        """
+        Compute per-aspect regression metrics on held-out essays
+        
+        Args:
+            essays: Essay strings (tokenized here if encodings absent)
+            scores: Dict of per-aspect target arrays on the 0-10 scale
+            encodings: Optional precomputed "input_ids"/"attention_mask"
+            batch_size: Inference batch size
+            
+        Returns:
+            Dict mapping aspect name to {"mse", "mae", "r2"}
+        """
+        if encodings is None:
+            tokenized = self.tokenizer(
+                list(essays), max_length=self.max_length,
+                padding="max_length", truncation=True, return_tensors="np"
+            )
+            encodings = {"input_ids": tokenized["input_ids"],
+                         "attention_mask": tokenized["attention_mask"]}
+        input_ids = np.asarray(encodings["input_ids"], np.int32)
+        attention_mask = np.asarray(encodings["attention_mask"], np.int32)
+        
+        preds = []
+        for i in range(0, len(input_ids), batch_size):
+            outputs = self._infer(
+                tf.constant(input_ids[i:i + batch_size]),
+                tf.constant(attention_mask[i:i + batch_size])
+            )
+            preds.append(np.hstack([np.asarray(o, np.float32) for o in outputs]))
+        # Heads are sigmoids on the 0-1 scale; targets are 0-10
+        preds = np.vstack(preds) * 10.0
+        
+        aspects = ("overall", "content", "organization", "language", "conventions")
+        metrics = {}
+        for i, aspect in enumerate(aspects):
+            target = np.asarray(scores[aspect], np.float32)
+            err = preds[:, i] - target
+            mse = float(np.mean(err ** 2))
+            variance = float(np.var(target))
+            metrics[aspect] = {
+                "mse": mse,
+                "mae": float(np.mean(np.abs(err))),
+                "r2": float(1.0 - mse / variance) if variance > 0 else 0.0
+            }
+        return metrics
+    
+    def plot_training_history(self, path="essay_training_history.png"):
+        """Plot the recorded per-epoch training loss to a PNG"""
+        if not self.history or not self.history.get("loss"):
+            logger.warning("No training history to plot")
+            return
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+        except ImportError:
+            logger.warning("matplotlib not installed, skipping history plot")
+            return
+        losses = self.history["loss"]
+        plt.figure()
+        plt.plot(range(1, len(losses) + 1), losses, label="loss")
+        plt.xlabel("Epoch")
+        plt.ylabel("Loss")
+        plt.legend()
+        plt.savefig(path)
+        plt.close()
+        logger.info(f"Training history plotted to {path}")
+    
+    def precompute_bert_embeddings(self, essay_texts, batch_size=16):
+        """
+        Run the frozen backbone once over a corpus of essays
+        
+        With the backbone frozen, head training only needs its outputs;
+        computing them once and training the attention/LSTM head on the
+        cached tensors removes the transformer forward pass from every
+        epoch. Stored as float16 to halve memory traffic.
+        
+        Args:
+            essay_texts: List of essay texts
+            batch_size: Backbone batch size
+            
+        Returns:
+            float16 array of shape (N, max_length, hidden_size)
+        """
+        if self.model is None:
+            self.build_advanced_model()
+        
+        shards = []
+        for start in range(0, len(essay_texts), batch_size):
+            chunk = [self.clean_text(text) for text in essay_texts[start:start + batch_size]]
+            encoding = self.tokenizer(
+                chunk,
+                truncation=True,
+                padding="max_length",
+                max_length=self.max_length,
+                return_tensors="tf"
+            )
+            outputs = self.bert_model(
+                encoding["input_ids"], attention_mask=encoding["attention_mask"], training=False
+            )[0]
+            shards.append(tf.cast(outputs, tf.float16).numpy())
+        
+        return np.concatenate(shards, axis=0)
+    
     def preprocess_essay(self, essay_text):
         """
         Preprocess essay text for model input
@@ -184,14 +532,15 @@ class AdvancedEssayScoringModel:
         # Clean and normalize text
         cleaned_text = self.clean_text(essay_text)
         
-        # Tokenize with BERT tokenizer
-        encoding = self.tokenizer(
-            cleaned_text,
-            truncation=True,
-            padding="max_length",
-            max_length=self.max_length,
-            return_tensors="tf"
-        )
+        # Tokenize at the true length, then pad up to the nearest
+        # power-of-two bucket (64..max_length). Attention cost scales
+        # with the square of the padded length, so a 100-token essay in
+        # the 128 bucket runs ~16x fewer attention FLOPs than at 512,
+        # while bucketing caps XLA retraces at four shapes.
+        encoding = self.tokenizer(cleaned_text, truncation=True, max_length=self.max_length)
+        length = len(encoding["input_ids"])
+        bucket = min(self.max_length, 1 << max(6, (length - 1).bit_length()))
+        encoding = self.tokenizer.pad([encoding], padding="max_length", max_length=bucket, return_tensors="tf")
         
         return {
             "input_ids": encoding["input_ids"],
@@ -209,14 +558,14 @@ class AdvancedEssayScoringModel:
             Cleaned text
         """
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
         # Fix common encoding issues
         text = text.replace('"', '"').replace('"', '"')
         text = text.replace(''', "'").replace(''', "'")
         
         # Ensure proper sentence endings
-        text = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', text)
+        text = _SENT_FIX_RE.sub(r'\1 \2', text)
         
         return text.strip()
     
@@ -238,8 +587,8 @@ class AdvancedEssayScoringModel:
         # Preprocess essay
         inputs = self.preprocess_essay(essay_text)
         
-        # Get predictions
-        predictions = self.model.predict(inputs, verbose=0)
+        # Get predictions through the compiled forward pass
+        predictions = self._infer(inputs["input_ids"], inputs["attention_mask"])
         
         # Scale predictions to 1-10 range
         scores = {
@@ -252,6 +601,53 @@ class AdvancedEssayScoringModel:
         
         return scores
     
+    def predict_scores_batch(self, essay_texts):
+        """
+        Predict scores for several essays in one batched model call
+        
+        Args:
+            essay_texts: List of essay texts to score
+            
+        Returns:
+            List of score dictionaries, one per essay
+        """
+        if not essay_texts:
+            return []
+
+        if self.model is None:
+            # Build model with default architecture if not loaded
+            self.build_advanced_model()
+            logger.warning("Using untrained model - scores may not be accurate")
+        
+        # Tokenize the whole batch at once
+        cleaned = [self.clean_text(text) for text in essay_texts]
+        encoding = self.tokenizer(
+            cleaned,
+            truncation=True,
+            padding="longest",
+            max_length=self.max_length,
+            return_tensors="tf"
+        )
+        inputs = {
+            "input_ids": encoding["input_ids"],
+            "attention_mask": encoding["attention_mask"]
+        }
+        
+        # One compiled forward pass for the whole batch
+        predictions = self._infer(inputs["input_ids"], inputs["attention_mask"])
+        
+        # Scale predictions to 1-10 range
+        return [
+            {
+                "overall": float(predictions[0][i][0]) * 9 + 1,
+                "content": float(predictions[1][i][0]) * 9 + 1,
+                "organization": float(predictions[2][i][0]) * 9 + 1,
+                "language": float(predictions[3][i][0]) * 9 + 1,
+                "conventions": float(predictions[4][i][0]) * 9 + 1
+            }
+            for i in range(len(essay_texts))
+        ]
+    
     def analyze_essay_features(self, essay_text):
         """
         Extract comprehensive features from essay
@@ -264,35 +660,54 @@ class AdvancedEssayScoringModel:
         """
         features = {}
         
-        # Basic statistics
-        words = essay_text.split()
-        sentences = re.split(r'[.!?]+', essay_text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        paragraphs = essay_text.split('\n\n')
-        paragraphs = [p.strip() for p in paragraphs if p.strip()]
+        # Lower and split the essay once; every count below reads these
+        # shared views instead of re-walking the text
+        text_lower = essay_text.lower()
+        words_lower = text_lower.split()
+        sentences = [stripped for s in _SENT_SPLIT_RE.split(essay_text) if (stripped := s.strip())]
+        paragraphs = [stripped for p in essay_text.split('\n\n') if (stripped := p.strip())]
         
-        features['word_count'] = len(words)
+        word_count = len(words_lower)
+        features['word_count'] = word_count
         features['sentence_count'] = len(sentences)
         features['paragraph_count'] = len(paragraphs)
-        features['avg_words_per_sentence'] = len(words) / max(len(sentences), 1)
+        features['avg_words_per_sentence'] = word_count / max(len(sentences), 1)
         features['avg_sentences_per_paragraph'] = len(sentences) / max(len(paragraphs), 1)
         
         # Vocabulary analysis
-        word_freq = Counter(word.lower() for word in words if word.isalpha())
+        word_freq = Counter(word for word in words_lower if word.isalpha())
         features['unique_words'] = len(word_freq)
-        features['vocabulary_diversity'] = len(word_freq) / max(len(words), 1)
+        features['vocabulary_diversity'] = len(word_freq) / max(word_count, 1)
         
         # Sentence complexity
         complex_sentences = sum(1 for s in sentences if len(s.split()) > 15)
         features['complex_sentence_ratio'] = complex_sentences / max(len(sentences), 1)
         
-        # Academic vocabulary
-        academic_words = self.count_academic_vocabulary(words)
-        features['academic_vocabulary_count'] = academic_words
-        features['academic_vocabulary_ratio'] = academic_words / max(len(words), 1)
+        # Academic vocabulary and transitions: one automaton pass over
+        # the lowered text replaces the per-word set lookups and the
+        # per-phrase substring scans. Boundary checks keep whole-word
+        # semantics for the single-word entries.
+        if _FEATURE_AC is not None:
+            academic_words = 0
+            transitions_seen = set()
+            text_len = len(text_lower)
+            for end, (kind, phrase) in _FEATURE_AC.iter(text_lower):
+                start = end - len(phrase) + 1
+                if start > 0 and (text_lower[start - 1].isalnum() or text_lower[start - 1] == '_'):
+                    continue
+                if end + 1 < text_len and (text_lower[end + 1].isalnum() or text_lower[end + 1] == '_'):
+                    continue
+                if "A" in kind:
+                    academic_words += 1
+                if "T" in kind:
+                    transitions_seen.add(phrase)
+            transitions = len(transitions_seen)
+        else:
+            academic_words = self.count_academic_vocabulary(words_lower)
+            transitions = self.count_transitions(text_lower)
         
-        # Transition words
-        transitions = self.count_transitions(essay_text)
+        features['academic_vocabulary_count'] = academic_words
+        features['academic_vocabulary_ratio'] = academic_words / max(word_count, 1)
         features['transition_count'] = transitions
         
         # Essay structure
@@ -301,49 +716,29 @@ class AdvancedEssayScoringModel:
         
         return features
     
-    def count_academic_vocabulary(self, words):
+    def count_academic_vocabulary(self, words_lower):
         """
         Count academic vocabulary words
         
         Args:
-            words: List of words
+            words_lower: List of lowercased words
             
         Returns:
             Count of academic words
         """
-        academic_words = {
-            'analyze', 'evaluate', 'demonstrate', 'illustrate', 'examine',
-            'investigate', 'establish', 'determine', 'significant', 'substantial',
-            'comprehensive', 'fundamental', 'essential', 'crucial', 'critical',
-            'perspective', 'approach', 'methodology', 'framework', 'concept',
-            'theory', 'hypothesis', 'evidence', 'research', 'study',
-            'analysis', 'conclusion', 'argument', 'thesis', 'claim',
-            'furthermore', 'moreover', 'however', 'nevertheless', 'consequently',
-            'therefore', 'thus', 'hence', 'accordingly', 'subsequently'
-        }
-        
-        return sum(1 for word in words if word.lower() in academic_words)
+        return sum(1 for word in words_lower if word in _ACADEMIC_WORDS)
     
-    def count_transitions(self, text):
+    def count_transitions(self, text_lower):
         """
         Count transition words and phrases
         
         Args:
-            text: Essay text
+            text_lower: Lowercased essay text
             
         Returns:
             Count of transitions
         """
-        transitions = [
-            'first', 'second', 'third', 'next', 'then', 'finally',
-            'however', 'furthermore', 'moreover', 'additionally',
-            'in addition', 'similarly', 'likewise', 'in contrast',
-            'on the other hand', 'meanwhile', 'consequently',
-            'therefore', 'thus', 'as a result', 'in conclusion'
-        ]
-        
-        text_lower = text.lower()
-        return sum(1 for transition in transitions if transition in text_lower)
+        return sum(1 for transition in _TRANSITIONS if transition in text_lower)
     
     def analyze_structure(self, essay_text, paragraphs):
         """
@@ -368,19 +763,11 @@ class AdvancedEssayScoringModel:
         
         # Check for introduction
         first_para = paragraphs[0].lower()
-        intro_indicators = [
-            'in this essay', 'this essay will', 'i will argue',
-            'the author suggests', 'this paper', 'the purpose of'
-        ]
-        structure['has_introduction'] = any(indicator in first_para for indicator in intro_indicators)
+        structure['has_introduction'] = any(indicator in first_para for indicator in _INTRO_INDICATORS)
         
         # Check for conclusion
         last_para = paragraphs[-1].lower()
-        conclusion_indicators = [
-            'in conclusion', 'to conclude', 'in summary',
-            'therefore', 'thus', 'overall', 'finally'
-        ]
-        structure['has_conclusion'] = any(indicator in last_para for indicator in conclusion_indicators)
+        structure['has_conclusion'] = any(indicator in last_para for indicator in _CONCLUSION_INDICATORS)
         
         # Body paragraphs
         structure['body_paragraph_count'] = max(0, len(paragraphs) - 2)
@@ -401,13 +788,46 @@ class AdvancedEssayScoringModel:
             Boolean indicating thesis presence
         """
         first_paragraph = text.split('\n')[0] if '\n' in text else text[:500]
-        thesis_indicators = [
-            'argue', 'claim', 'believe', 'suggest', 'propose',
-            'maintain', 'assert', 'contend', 'demonstrate',
-            'prove', 'show', 'will discuss', 'will examine'
-        ]
+        first_lower = first_paragraph.lower()
+        return any(indicator in first_lower for indicator in _THESIS_INDICATORS)
+    
+    def export_onnx(self, path="advanced_essay_model.onnx"):
+        """
+        Export the model to ONNX and apply transformer kernel fusions
+        
+        ONNX Runtime's BERT optimizer fuses the MatMul/BiasAdd/Transpose
+        chains of the attention blocks (both in the backbone and the
+        custom essay_attention layer) into single Attention kernels and
+        merges the residual LayerNorms, which trims per-token launch
+        overhead at inference time.
+        
+        Args:
+            path: Output path for the .onnx file
+            
+        Returns:
+            Path to the exported model
+        """
+        if not TF2ONNX_AVAILABLE:
+            raise RuntimeError("tf2onnx is required for ONNX export")
+        
+        if self.model is None:
+            self.build_advanced_model()
         
-        return any(indicator in first_paragraph.lower() for indicator in thesis_indicators)
+        spec = (
+            tf.TensorSpec((None, self.max_length), tf.int32, name="input_ids"),
+            tf.TensorSpec((None, self.max_length), tf.int32, name="attention_mask"),
+        )
+        tf2onnx.convert.from_keras(self.model, input_signature=spec, opset=17, output_path=path)
+        
+        try:
+            from onnxruntime.transformers import optimizer as ort_optimizer
+            optimized = ort_optimizer.optimize_model(path, model_type="bert", num_heads=12, hidden_size=768)
+            optimized.save_model_to_file(path)
+            logger.info(f"ONNX model exported with attention fusions to {path}")
+        except ImportError:
+            logger.warning("onnxruntime.transformers not available; exported unfused ONNX graph")
+        
+        return path
     
     def save_model(self, path="advanced_essay_model"):
         """
@@ -421,7 +841,11 @@ class AdvancedEssayScoringModel:
         
         os.makedirs(path, exist_ok=True)
         
-        # Save model weights
+        # Full SavedModel: loading it skips rebuilding the graph and
+        # re-fetching pretrained backbone weights just to overwrite them
+        self.model.save(f"{path}/saved_model", include_optimizer=False)
+        
+        # Save model weights (legacy load path)
         self.model.save_weights(f"{path}/model_weights.h5")
         
         # Save model architecture
@@ -458,13 +882,18 @@ class AdvancedEssayScoringModel:
             self.max_length = config["max_length"]
             
             # Load tokenizer
-            self.tokenizer = BertTokenizer.from_pretrained(f"{path}/tokenizer")
+            self.tokenizer = AutoTokenizer.from_pretrained(f"{path}/tokenizer", use_fast=True)
             
-            # Build model architecture
-            self.build_advanced_model()
-            
-            # Load weights
-            self.model.load_weights(f"{path}/model_weights.h5")
+            saved_model_dir = f"{path}/saved_model"
+            if os.path.isdir(saved_model_dir):
+                # Preferred path: load the serialized graph directly
+                self.model = tf.keras.models.load_model(saved_model_dir, compile=False)
+                self._compile_infer()
+            else:
+                # Legacy path: rebuild the architecture, then overwrite
+                # the freshly initialized weights
+                self.build_advanced_model()
+                self.model.load_weights(f"{path}/model_weights.h5")
             
             logger.info(f"Model loaded from {path}")
         except Exception as e:
@@ -472,8 +901,76 @@ class AdvancedEssayScoringModel:
             # Build default model
             self.build_advanced_model()
 
-# Singleton instance
+# Name the training scripts import by; the class predates the
+# "Advanced" rename
+EssayScoringModel = AdvancedEssayScoringModel
+
+class BatchedEssayScorer:
+    """
+    Micro-batching front end for concurrent scoring requests
+    
+    Collects requests arriving within a short window, packs them into a
+    single batched forward pass and scatters the results back through
+    futures. Amortizes tokenization setup and kernel launches when
+    several web requests land together; a lone request only waits out
+    the (small) batching window.
+    """
+    def __init__(self, model=None, max_batch=32, max_wait_ms=10.0):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+    
+    def submit(self, essay_text):
+        """Queue an essay for scoring; returns a Future of the score dict"""
+        future = Future()
+        self._queue.put((essay_text, future))
+        return future
+    
+    def predict(self, essay_text):
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(essay_text).result()
+    
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            model = self.model if self.model is not None else get_essay_model()
+            try:
+                results = model.predict_scores_batch([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), scores in zip(batch, results):
+                future.set_result(scores)
+
+# Singleton instances
 essay_model = None
+batched_scorer = None
+
+def get_batched_scorer():
+    """
+    Get or create the micro-batching scorer instance
+    
+    Returns:
+        BatchedEssayScorer instance
+    """
+    global batched_scorer
+    if batched_scorer is None:
+        batched_scorer = BatchedEssayScorer()
+    return batched_scorer
 
 def get_essay_model():
     """
@@ -500,6 +997,19 @@ def predict_essay_scores(essay_text):
     model = get_essay_model()
     return model.predict_scores(essay_text)
 
+def predict_essay_scores_batch(essay_texts):
+    """
+    Predict scores for a batch of essays with a single model call
+    
+    Args:
+        essay_texts: List of essay texts to score
+        
+    Returns:
+        List of score dictionaries
+    """
+    model = get_essay_model()
+    return model.predict_scores_batch(essay_texts)
+
 def analyze_essay_features(essay_text):
     """
     Analyze essay features
@@ -513,6 +1023,21 @@ def analyze_essay_features(essay_text):
     model = get_essay_model()
     return model.analyze_essay_features(essay_text)
 
+# Optional eager warm-up: building the graph and tracing the compiled
+# forward pass at import time moves the multi-second cold start (weight
+# download/parse plus XLA compile) out of the first user request.
+# Opt-in via env so one-shot CLI invocations stay lazy.
+if os.getenv("WARMUP_ESSAY_MODEL"):
+    _warm = get_essay_model()
+    if _warm.model is None:
+        _warm.build_advanced_model()
+    _warm._infer(
+        tf.zeros((1, _warm.max_length), tf.int32),
+        tf.ones((1, _warm.max_length), tf.int32),
+    )
+    logger.info("Essay model warmed up at import")
+    del _warm
+
 if __name__ == "__main__":
     # Test the model
     test_essay = """
@@ -6,36 +6,55 @@ Extract audio features for accent recognition and analysis
 import sys
 import os
 import json
+import base64
 import numpy as np
 import librosa
 import librosa.display
 import soundfile as sf
 from scipy.signal import lfilter
 
+from extract_mfcc import compute_deltas
+
+# pyworld's C implementation of DIO+StoneMask is 10-50x faster than
+# librosa's pure-Python pyin Viterbi decoder; fall back when missing
+try:
+    import pyworld
+    PYWORLD_AVAILABLE = True
+except ImportError:
+    PYWORLD_AVAILABLE = False
+
 def extract_features(audio_path):
     """Extract audio features for accent recognition and analysis"""
     try:
-        # Load audio file
-        y, sr = librosa.load(audio_path, sr=16000)
+        # Load audio file; pin the SIMD soxr resampler so installs where
+        # librosa falls back to resampy don't pay a pure-Python resample
+        y, sr = librosa.load(audio_path, sr=16000, res_type='soxr_hq')
         
         # Basic features
         duration = librosa.get_duration(y=y, sr=sr)
         
-        # Extract mel spectrogram
+        # Extract mel spectrogram once; the MFCCs are derived from the
+        # same mel bands below instead of re-running the STFT pipeline
         mel_spec = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=80)
-        mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
+        log_mel = librosa.power_to_db(mel_spec)
+        mel_spec_db = log_mel - log_mel.max()
         
-        # Extract MFCC features
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-        mfcc_delta = librosa.feature.delta(mfcc)
-        mfcc_delta2 = librosa.feature.delta(mfcc, order=2)
+        # Extract MFCC features from the precomputed log-mel spectrogram
+        mfcc = librosa.feature.mfcc(S=log_mel, sr=sr, n_mfcc=13)
+        mfcc_delta = compute_deltas(mfcc)
+        mfcc_delta2 = compute_deltas(mfcc, order=2)
         
         # Extract pitch (F0) features
-        f0, voiced_flag, voiced_probs = librosa.pyin(y, 
-                                                    fmin=librosa.note_to_hz('C2'), 
-                                                    fmax=librosa.note_to_hz('C7'),
-                                                    sr=sr)
-        f0 = np.nan_to_num(f0)
+        if PYWORLD_AVAILABLE:
+            y64 = y.astype(np.float64)
+            f0, t = pyworld.dio(y64, sr)
+            f0 = pyworld.stonemask(y64, f0, t, sr)
+        else:
+            f0, voiced_flag, voiced_probs = librosa.pyin(y, 
+                                                        fmin=librosa.note_to_hz('C2'), 
+                                                        fmax=librosa.note_to_hz('C7'),
+                                                        sr=sr)
+            f0 = np.nan_to_num(f0)
         f0_mean = np.mean(f0[f0 > 0]) if np.any(f0 > 0) else 0
         f0_std = np.std(f0[f0 > 0]) if np.any(f0 > 0) else 0
         
@@ -76,7 +95,13 @@ def extract_features(audio_path):
             "vowel_space": float(vowel_space),
             "mfcc_mean": np.mean(mfcc, axis=1).tolist(),
             "mfcc_std": np.std(mfcc, axis=1).tolist(),
-            "mel_spectrogram": mel_spec_db.tolist(),
+            # The mel spectrogram is 80x100 floats; shipping it as a
+            # base64 float16 buffer is ~8x smaller and far cheaper than
+            # boxing 8000 Python floats through json. Decode with
+            # np.frombuffer(..., dtype=np.float16).reshape(shape).
+            "mel_spectrogram": base64.b64encode(mel_spec_db.astype(np.float16).tobytes()).decode("ascii"),
+            "mel_spectrogram_shape": list(mel_spec_db.shape),
+            "mel_spectrogram_dtype": "float16",
             "energy_mean": float(np.mean(energy)),
             "energy_std": float(np.std(energy)),
         }
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Persistent feature-extraction worker
+
+Reads one audio file path per stdin line and writes one JSON feature
+payload per stdout line. The per-file CLI scripts pay the ~1-2 s
+numpy/librosa import cost on every invocation; a pool of long-lived
+workers (one per core, spawned once from the Node side) amortizes that
+across the whole batch.
+
+Usage:
+    python extract_worker.py            # full feature set per path
+    python extract_worker.py mfcc       # MFCC features per path
+"""
+import sys
+import json
+
+from extract_audio_features import extract_features
+from extract_mfcc import extract_mfcc_features, _dumps
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else "features"
+    extract = extract_mfcc_features if mode == "mfcc" else extract_features
+
+    for line in sys.stdin:
+        path = line.strip()
+        if not path:
+            continue
+        try:
+            # Serialize inside the guard: mfcc payloads carry numpy
+            # arrays that only the numpy-aware _dumps can encode, and a
+            # bad payload must degrade to an error line, not kill the
+            # worker
+            out = _dumps(extract(path))
+        except (Exception, SystemExit) as e:
+            # Keep the worker alive on bad files
+            out = json.dumps({"error": str(e) or "extraction failed"})
+        sys.stdout.write(out + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,11 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 import tensorflow as tf
+from transformers import AutoTokenizer
 from essay_model import EssayScoringModel
 import logging
 import json
 import requests
-from io import StringIO
 
 # Configure logging
 logging.basicConfig(
@@ -32,11 +32,13 @@ def download_dataset(url):
         Pandas DataFrame
     """
     logger.info(f"Downloading dataset from {url}")
-    response = requests.get(url)
-    response.raise_for_status()
-    
-    # Parse CSV
-    data = pd.read_csv(StringIO(response.text))
+    # Stream the body straight into pandas' C parser instead of
+    # materializing the whole CSV as a string and copying it through
+    # StringIO — one pass, one copy
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        data = pd.read_csv(response.raw)
     logger.info(f"Downloaded dataset with {len(data)} rows")
     
     return data
@@ -61,40 +63,76 @@ def preprocess_dataset(data):
     
     # Generate synthetic scores for different aspects
     # In a real implementation, you would use actual scores for each aspect
-    overall_scores = data["score"].values / 10.0  # Normalize to 0-1 range
-    
-    # Create synthetic scores for different aspects
-    np.random.seed(42)
-    content_scores = overall_scores * 0.9 + np.random.normal(0, 0.05, len(overall_scores))
-    organization_scores = overall_scores * 0.85 + np.random.normal(0, 0.05, len(overall_scores))
-    language_scores = overall_scores * 0.95 + np.random.normal(0, 0.05, len(overall_scores))
-    conventions_scores = overall_scores * 0.8 + np.random.normal(0, 0.05, len(overall_scores))
+    overall_scores = (data["score"].values / 10.0).astype(np.float32)  # Normalize to 0-1 range
     
-    # Clip scores to 0-1 range
-    content_scores = np.clip(content_scores, 0, 1)
-    organization_scores = np.clip(organization_scores, 0, 1)
-    language_scores = np.clip(language_scores, 0, 1)
-    conventions_scores = np.clip(conventions_scores, 0, 1)
+    # Create synthetic scores for the four aspects in one (4, N) buffer,
+    # mutated in place: the Generator API plus out= clipping avoids the
+    # eight intermediate arrays the per-aspect normal/clip calls built
+    rng = np.random.default_rng(42)
+    factors = np.array([0.9, 0.85, 0.95, 0.8], dtype=np.float32)
+    aspect_scores = overall_scores[None, :] * factors[:, None]
+    aspect_scores += 0.05 * rng.standard_normal(aspect_scores.shape, dtype=np.float32)
+    np.clip(aspect_scores, 0, 1, out=aspect_scores)
     
     # Scale scores to 0-10 range
+    aspect_scores *= 10
     overall_scores = overall_scores * 10
-    content_scores = content_scores * 10
-    organization_scores = organization_scores * 10
-    language_scores = language_scores * 10
-    conventions_scores = conventions_scores * 10
     
     # Create scores dictionary
     scores = {
         "overall": overall_scores,
-        "content": content_scores,
-        "organization": organization_scores,
-        "language": language_scores,
-        "conventions": conventions_scores
+        "content": aspect_scores[0],
+        "organization": aspect_scores[1],
+        "language": aspect_scores[2],
+        "conventions": aspect_scores[3]
     }
     
     logger.info(f"Preprocessed {len(essays)} essays")
     return essays, scores
 
+def tokenize_essays(essays, cache_path, bert_model_name="distilbert-base-uncased", max_length=512):
+    """
+    Tokenize essays once with the fast (Rust-backed) tokenizer and cache
+    the ids to disk
+    
+    WordPiece tokenization re-run inside every training epoch is a
+    significant CPU cost; caching the encoded arrays makes repeat
+    training runs skip it entirely.
+    
+    Args:
+        essays: List of essay strings
+        cache_path: Path of the .npz cache file
+        bert_model_name: Hugging Face model whose tokenizer to use
+        max_length: Maximum token sequence length
+        
+    Returns:
+        Dict with "input_ids" and "attention_mask" numpy arrays
+    """
+    if os.path.exists(cache_path):
+        cached = np.load(cache_path)
+        if len(cached["input_ids"]) == len(essays):
+            logger.info(f"Loaded tokenized essays from {cache_path}")
+            return {"input_ids": cached["input_ids"],
+                    "attention_mask": cached["attention_mask"]}
+    
+    logger.info(f"Tokenizing {len(essays)} essays")
+    tokenizer = AutoTokenizer.from_pretrained(bert_model_name, use_fast=True)
+    encodings = tokenizer(
+        essays,
+        max_length=max_length,
+        padding="max_length",
+        truncation=True,
+        return_tensors="np"
+    )
+    np.savez_compressed(
+        cache_path,
+        input_ids=encodings["input_ids"],
+        attention_mask=encodings["attention_mask"]
+    )
+    logger.info(f"Cached tokenized essays to {cache_path}")
+    return {"input_ids": encodings["input_ids"],
+            "attention_mask": encodings["attention_mask"]}
+
 def main():
     """
     Main training function
@@ -110,17 +148,45 @@ def main():
     # Preprocess dataset
     essays, scores = preprocess_dataset(data)
     
-    # Split data into train and test sets
-    essays_train, essays_test, scores_train, scores_test = train_test_split(
+    # Split data into train and test sets. Stacking the five aspect
+    # arrays into one (N, 5) matrix lets sklearn apply a single
+    # permutation to contiguous memory (and fixes the previous dict
+    # argument, which train_test_split cannot index)
+    aspect_keys = ("overall", "content", "organization", "language", "conventions")
+    score_mat = np.stack([scores[k] for k in aspect_keys], axis=1).astype(np.float32)
+    essays_train, essays_test, scores_train_mat, scores_test_mat = train_test_split(
         essays,
-        {k: v for k, v in scores.items()},
+        score_mat,
         test_size=0.2,
         random_state=42
     )
+    scores_train = {k: scores_train_mat[:, i] for i, k in enumerate(aspect_keys)}
+    scores_test = {k: scores_test_mat[:, i] for i, k in enumerate(aspect_keys)}
     
     logger.info(f"Training set: {len(essays_train)} essays")
     logger.info(f"Test set: {len(essays_test)} essays")
     
+    # Fine-tune in float16 on GPU: transformer matmuls hit Tensor Cores
+    # and activations take half the memory, which is what lets the batch
+    # sizes below run at 16/8 instead of 8/4. The model keeps its score
+    # heads in float32 and wraps the optimizer in a LossScaleOptimizer.
+    if tf.config.list_physical_devices('GPU'):
+        tf.keras.mixed_precision.set_global_policy('mixed_float16')
+    
+    # Tokenize once up front (cached across runs) so epochs feed the
+    # model pre-encoded ids instead of re-tokenizing raw strings
+    encodings_train = tokenize_essays(essays_train, "essay_tokens_train.npz")
+    encodings_test = tokenize_essays(essays_test, "essay_tokens_test.npz")
+    
+    # Feed training through a tf.data pipeline built on the cached
+    # encodings: shuffling, batching and the host-to-device copy of the
+    # next batch overlap with the current step's GPU compute
+    train_ds = tf.data.Dataset.from_tensor_slices((
+        {"input_ids": encodings_train["input_ids"],
+         "attention_mask": encodings_train["attention_mask"]},
+        scores_train
+    )).shuffle(1024).batch(16).prefetch(tf.data.AUTOTUNE)
+    
     # Initialize model
     model = EssayScoringModel(bert_model_name="distilbert-base-uncased", max_length=512)
     
@@ -131,24 +197,27 @@ def main():
     logger.info("Starting model training")
     model.train(
         essays=essays_train,
+        encodings=encodings_train,
         scores=scores_train,
+        dataset=train_ds,
         validation_split=0.2,
         epochs=5,
-        batch_size=8
+        batch_size=16
     )
     
     # Fine-tune model
     logger.info("Starting model fine-tuning")
     model.fine_tune(
         essays=essays_train,
+        encodings=encodings_train,
         scores=scores_train,
         epochs=3,
-        batch_size=4
+        batch_size=8
     )
     
     # Evaluate model
     logger.info("Evaluating model")
-    metrics = model.evaluate(essays_test, scores_test)
+    metrics = model.evaluate(essays_test, scores_test, encodings=encodings_test)
     
     # Print evaluation metrics
     logger.info("Evaluation metrics:")
@@ -12,6 +12,24 @@ import librosa
 import json
 import os
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _pad_kernel(flat, offsets, lengths, out):
+        for i in prange(offsets.shape[0]):
+            out[i, :lengths[i]] = flat[offsets[i]:offsets[i] + lengths[i]]
+
+# Train with float16 compute and float32 master weights on GPU: the
+# Conv/LSTM stack is matmul-bound and maps onto Tensor Cores, roughly
+# halving step time and activation memory. CPU runs stay in float32.
+if tf.config.list_physical_devices('GPU'):
+    tf.keras.mixed_precision.set_global_policy('mixed_float16')
+
 class PronunciationModelTrainer:
     def __init__(self):
         self.model = None
@@ -41,11 +59,14 @@ class PronunciationModelTrainer:
             # Reshape for LSTM
             Reshape((-1, 256)),
             
-            # LSTM layers for temporal modeling
-            LSTM(256, return_sequences=True, dropout=0.3, recurrent_dropout=0.3),
+            # LSTM layers for temporal modeling. No recurrent_dropout:
+            # any nonzero value forces the per-step generic kernel, while
+            # recurrent_dropout=0 lets Keras dispatch to the fused cuDNN
+            # implementation (several times faster on GPU)
+            LSTM(256, return_sequences=True, dropout=0.3),
             BatchNormalization(),
             
-            LSTM(128, return_sequences=True, dropout=0.3, recurrent_dropout=0.3),
+            LSTM(128, return_sequences=True, dropout=0.3),
             BatchNormalization(),
             
             LSTM(64, return_sequences=False, dropout=0.3),
@@ -55,18 +76,26 @@ class PronunciationModelTrainer:
             Dropout(0.5),
             Dense(64, activation='relu'),
             
-            # Multi-task output
-            Dense(50, activation='sigmoid', name='pronunciation_output')
+            # Multi-task output; keep the head in float32 so the sigmoid
+            # does not saturate in half precision
+            Dense(50, activation='sigmoid', dtype='float32', name='pronunciation_output')
         ])
         
         return model
     
     def compile_model(self, model):
         """Compile the model with appropriate loss and metrics"""
+        optimizer = Adam(learning_rate=0.001)
+        if tf.keras.mixed_precision.global_policy().name == 'mixed_float16':
+            # Dynamic loss scaling keeps float16 gradients from underflowing
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
         model.compile(
-            optimizer=Adam(learning_rate=0.001),
+            optimizer=optimizer,
             loss='mean_squared_error',
-            metrics=['accuracy', 'mean_absolute_error']
+            metrics=['accuracy', 'mean_absolute_error'],
+            # XLA fuses the conv/BN/activation regions into single
+            # kernels, cutting intermediate memory traffic
+            jit_compile=True
         )
         return model
     
@@ -75,45 +104,58 @@ class PronunciationModelTrainer:
         # This would load and preprocess real training data
         # For now, we'll create synthetic data for demonstration
         
-        # Synthetic training data
+        # Synthetic training data, sampled in bulk instead of one
+        # Python-level draw per sample
         num_samples = 1000
         max_length = 100  # Maximum sequence length
         
-        X = []
-        y = []
+        # One contiguous (samples, frames, mfcc) buffer; frames beyond
+        # each sample's random length are zeroed with a boolean mask,
+        # which doubles as the padding step
+        seq_lengths = np.random.randint(50, max_length, size=num_samples)
+        X = np.random.randn(num_samples, max_length, 13).astype(np.float32)
+        mask = np.arange(max_length)[None, :] < seq_lengths[:, None]
+        X *= mask[..., None]
         
-        for i in range(num_samples):
-            # Random sequence length
-            seq_length = np.random.randint(50, max_length)
-            
-            # Random MFCC features
-            mfcc_features = np.random.randn(seq_length, 13)
-            X.append(mfcc_features)
-            
-            # Random target scores
-            pronunciation_score = np.random.beta(2, 1)  # Skewed towards higher scores
-            fluency_score = np.random.beta(2, 1)
-            accuracy_score = np.random.beta(2, 1)
-            
-            # Random phoneme scores
-            phoneme_scores = np.random.beta(2, 1, 39)  # 39 phonemes
-            
-            # Combine targets
-            target = np.concatenate([[pronunciation_score, fluency_score, accuracy_score], phoneme_scores, np.random.rand(8)])
-            y.append(target)
+        # Pronunciation/fluency/accuracy plus 39 phoneme scores are
+        # beta(2, 1) (skewed towards higher scores); the last 8 targets
+        # are uniform
+        y = np.concatenate(
+            [np.random.beta(2, 1, (num_samples, 3 + 39)),
+             np.random.rand(num_samples, 8)],
+            axis=1
+        )
         
         return X, y
     
     def pad_sequences(self, sequences, maxlen=None):
         """Pad sequences to the same length"""
+        if isinstance(sequences, np.ndarray) and sequences.ndim == 3:
+            # Already a rectangular batch (e.g. from prepare_data)
+            if maxlen is None or maxlen == sequences.shape[1]:
+                return sequences
+        
         if maxlen is None:
             maxlen = max(len(seq) for seq in sequences)
         
-        padded = np.zeros((len(sequences), maxlen, sequences[0].shape[1]))
+        lengths = np.fromiter(
+            (min(len(seq), maxlen) for seq in sequences),
+            dtype=np.int64, count=len(sequences)
+        )
+        padded = np.zeros((len(sequences), maxlen, sequences[0].shape[1]), np.float32)
         
-        for i, seq in enumerate(sequences):
-            length = min(len(seq), maxlen)
-            padded[i, :length] = seq[:length]
+        if NUMBA_AVAILABLE:
+            # Lay all frames out contiguously once, then scatter rows in
+            # parallel instead of slicing per sample in the interpreter
+            flat = np.concatenate(
+                [np.asarray(seq[:maxlen], np.float32) for seq in sequences], axis=0
+            )
+            offsets = np.zeros(len(sequences), np.int64)
+            np.cumsum(lengths[:-1], out=offsets[1:])
+            _pad_kernel(flat, offsets, lengths, padded)
+        else:
+            for i, seq in enumerate(sequences):
+                padded[i, :lengths[i]] = seq[:lengths[i]]
         
         return padded
     
@@ -123,10 +165,25 @@ class PronunciationModelTrainer:
         X_train_padded = self.pad_sequences(X_train)
         X_train_padded = X_train_padded.reshape(X_train_padded.shape[0], X_train_padded.shape[1], X_train_padded.shape[2], 1)
         
+        # tf.data pipelines keep host-side shuffling/batching off the
+        # training step's critical path; prefetch overlaps the next
+        # batch's preparation (and H2D copy on GPU) with model compute
+        train_ds = tf.data.Dataset.from_tensor_slices(
+            (X_train_padded, np.asarray(y_train))
+        ).shuffle(1024).batch(32).prefetch(tf.data.AUTOTUNE)
+        
+        on_gpu = bool(tf.config.list_physical_devices('GPU'))
+        if on_gpu:
+            train_ds = train_ds.apply(
+                tf.data.experimental.prefetch_to_device('/gpu:0')
+            )
+        
         if X_val is not None:
             X_val_padded = self.pad_sequences(X_val, X_train_padded.shape[1])
             X_val_padded = X_val_padded.reshape(X_val_padded.shape[0], X_val_padded.shape[1], X_val_padded.shape[2], 1)
-            validation_data = (X_val_padded, np.array(y_val))
+            validation_data = tf.data.Dataset.from_tensor_slices(
+                (X_val_padded, np.asarray(y_val))
+            ).batch(32).prefetch(tf.data.AUTOTUNE)
         else:
             validation_data = None
         
@@ -137,15 +194,16 @@ class PronunciationModelTrainer:
         # Callbacks
         callbacks = [
             EarlyStopping(patience=10, restore_best_weights=True),
-            ModelCheckpoint('best_pronunciation_model.h5', save_best_only=True)
+            # Native .keras format: one zipped archive instead of the
+            # legacy HDF5 per-tensor writes, noticeably faster for the
+            # LSTM-heavy weight set
+            ModelCheckpoint('best_pronunciation_model.keras', save_best_only=True)
         ]
         
         # Train the model
         history = self.model.fit(
-            X_train_padded,
-            np.array(y_train),
+            train_ds,
             epochs=epochs,
-            batch_size=32,
             validation_data=validation_data,
             callbacks=callbacks,
             verbose=1
@@ -156,11 +214,40 @@ class PronunciationModelTrainer:
     def save_model(self, filepath):
         """Save the trained model"""
         if self.model:
+            if not filepath.endswith('.keras'):
+                filepath += '.keras'
             self.model.save(filepath)
             print(f"Model saved to {filepath}")
         else:
             print("No model to save. Train the model first.")
     
+    def export_tflite_int8(self, X_rep, filepath='pronunciation_int8.tflite'):
+        """Export an int8-quantized TFLite model for CPU inference
+        
+        Post-training quantization with a representative sample lets the
+        live feedback path run int8 GEMMs at roughly half the memory
+        bandwidth of the float32 graph.
+        """
+        if not self.model:
+            print("No model to export. Train the model first.")
+            return
+        
+        X_rep = self.pad_sequences(X_rep)
+        X_rep = X_rep.reshape(X_rep.shape[0], X_rep.shape[1], X_rep.shape[2], 1)
+        
+        def representative_dataset():
+            for sample in X_rep[:100]:
+                yield [sample[None].astype(np.float32)]
+        
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        
+        with open(filepath, 'wb') as f:
+            f.write(converter.convert())
+        print(f"Quantized model saved to {filepath}")
+    
     def evaluate_model(self, X_test, y_test):
         """Evaluate the model on test data"""
         if self.model:
@@ -197,7 +284,10 @@ def main():
     history = trainer.train_model(X_train, y_train, X_val, y_val, epochs=50)
     
     # Save model
-    trainer.save_model("pronunciation_model.h5")
+    trainer.save_model("pronunciation_model.keras")
+    
+    # Export an int8 model for the inference endpoints
+    trainer.export_tflite_int8(X_val)
     
     # Save training history
     with open("training_history.json", "w") as f:
@@ -8,52 +8,152 @@ import os
 import json
 import time
 import torch
-import numpy as np
-import librosa
 import whisper
+from whisper.audio import load_audio
 from datetime import datetime
 
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# Loaded once per process: reloading ~75 MB of weights on every call
+# dominates latency for short clips, so the model is cached here and
+# reused by --serve mode and repeated process_audio calls
+_MODEL = None
+
+def _get_model():
+    """Load the Whisper model on first use and reuse it afterwards"""
+    global _MODEL
+    if _MODEL is None:
+        if FASTER_WHISPER_AVAILABLE:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            _MODEL = WhisperModel("tiny", device=device, compute_type=compute_type)
+        else:
+            # Use "tiny" for quick processing, "base" for better accuracy
+            # In production, use "small" or "medium" for better results
+            _MODEL = whisper.load_model("tiny")
+            # TF32 matmuls on Ampere+ and TorchInductor-fused
+            # encoder/decoder graphs cut the eager per-op dispatch cost
+            # of the autoregressive decode loop; torch < 2.0 has neither
+            if hasattr(torch, "compile"):
+                try:
+                    torch.set_float32_matmul_precision("high")
+                    _MODEL.encoder = torch.compile(_MODEL.encoder, mode="reduce-overhead")
+                    _MODEL.decoder = torch.compile(_MODEL.decoder, mode="reduce-overhead")
+                except Exception:
+                    pass
+    return _MODEL
+
+_BATCHED = None
+
+def _get_batched_pipeline():
+    """Batched faster-whisper pipeline, created lazily alongside the model
+    
+    The pipeline splits a clip on voice activity and decodes the pieces
+    as one batch, which keeps the GPU busy on clips long enough to have
+    several segments.
+    """
+    global _BATCHED
+    if _BATCHED is None and FASTER_WHISPER_AVAILABLE:
+        _BATCHED = BatchedInferencePipeline(model=_get_model())
+    return _BATCHED
+
 def process_audio(audio_path, language="en"):
     """Process audio file with Whisper model and return transcription with word timestamps"""
     start_time = time.time()
     
     try:
-        # Load Whisper model - use "tiny" for quick processing, "base" for better accuracy
-        # In production, use "small" or "medium" for better results
-        model = whisper.load_model("tiny")
+        model = _get_model()
         
-        # Load audio
-        audio, sr = librosa.load(audio_path, sr=16000, mono=True)
-        
-        # Get transcription
-        result = model.transcribe(
-            audio, 
-            language=language,
-            word_timestamps=True,
-            verbose=False
-        )
-        
-        # Process word timestamps
-        word_timestamps = []
-        for segment in result["segments"]:
-            for word in segment.get("words", []):
-                word_timestamps.append({
-                    "word": word["word"].strip(),
-                    "start": word["start"],
-                    "end": word["end"],
-                    "confidence": word.get("confidence", 0.0)
+        if FASTER_WHISPER_AVAILABLE:
+            # CTranslate2 backend with int8 weights: ~4x faster than the
+            # reference FP32 model on CPU at comparable accuracy, with
+            # float16 activations when a GPU is available. The path goes
+            # straight to transcribe so decoding streams inside the
+            # library instead of materializing the whole clip here, and
+            # the VAD filter drops silent regions before the decoder
+            # sees them
+            segment_iter, info = _get_batched_pipeline().transcribe(
+                audio_path,
+                language=language,
+                word_timestamps=True,
+                beam_size=1,
+                batch_size=8,
+                vad_filter=True
+            )
+            
+            # Materialize the lazy segment iterator into the same JSON
+            # shape the reference package produces
+            segments = []
+            word_timestamps = []
+            conf_sum = 0.0
+            for segment in segment_iter:
+                words = [
+                    {
+                        "word": word.word.strip(),
+                        "start": word.start,
+                        "end": word.end,
+                        "confidence": word.probability
+                    }
+                    for word in (segment.words or [])
+                ]
+                word_timestamps.extend(words)
+                conf_sum += sum(word["confidence"] for word in words)
+                segments.append({
+                    "id": segment.id,
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text,
+                    "words": words
                 })
+            
+            text = "".join(segment["text"] for segment in segments)
+            detected_language = info.language
+        else:
+            # Load audio: ffmpeg decodes straight to 16 kHz mono f32le in
+            # a subprocess, skipping librosa's audioread/resample
+            # round-trip
+            audio = load_audio(audio_path, sr=16000)
+            
+            # Get transcription
+            result = model.transcribe(
+                audio, 
+                language=language,
+                word_timestamps=True,
+                verbose=False
+            )
+            
+            # Process word timestamps
+            word_timestamps = []
+            conf_sum = 0.0
+            for segment in result["segments"]:
+                for word in segment.get("words", []):
+                    confidence = word.get("confidence", 0.0)
+                    conf_sum += confidence
+                    word_timestamps.append({
+                        "word": word["word"].strip(),
+                        "start": word["start"],
+                        "end": word["end"],
+                        "confidence": confidence
+                    })
+            
+            text = result["text"]
+            detected_language = result["language"]
+            segments = result["segments"]
         
         # Calculate processing time
         processing_time = time.time() - start_time
         
         # Prepare result
         output = {
-            "text": result["text"],
-            "language": result["language"],
-            "segments": result["segments"],
+            "text": text,
+            "language": detected_language,
+            "segments": segments,
             "word_timestamps": word_timestamps,
-            "confidence": np.mean([word.get("confidence", 0.0) for word in word_timestamps]) if word_timestamps else 0.0,
+            "confidence": conf_sum / len(word_timestamps) if word_timestamps else 0.0,
             "processing_time": processing_time
         }
         
@@ -68,7 +168,29 @@ def process_audio(audio_path, language="en"):
             "processing_time": time.time() - start_time
         }
 
+def serve():
+    """Process one JSON request per stdin line against the cached model
+    
+    Lets the Node backend keep a persistent child process instead of
+    paying the interpreter start-up and model load on every clip.
+    Requests look like {"path": "...", "language": "en"}.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            req = json.loads(line)
+            result = process_audio(req["path"], req.get("language", "en"))
+        except Exception as e:
+            result = {"error": str(e)}
+        print(json.dumps(result), flush=True)
+
 if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        serve()
+        sys.exit(0)
+    
     if len(sys.argv) < 2:
         print(json.dumps({"error": "Audio file path is required"}))
         sys.exit(1)